@@ -849,7 +849,9 @@ def _normalize_assertion(entry: dict[str, Any]) -> dict[str, Any]:
     return result
 
 
-def parse_stdout_segments(stdout: str) -> list[Segment]:
+def parse_stdout_segments(
+    stdout: str, include_text: bool = True,
+) -> list[Segment]:
     """Parse test stdout into interleaved text and block segments.
 
     Splits stdout into a sequence of ``TextSegment`` (plain text) and
@@ -863,6 +865,9 @@ def parse_stdout_segments(stdout: str) -> list[Segment]:
 
     Args:
         stdout: Raw stdout string from a test execution.
+        include_text: When False, plain text outside blocks is dropped
+            instead of being collected into ``TextSegment`` objects, so
+            callers that only need blocks get ``BlockSegment`` items only.
 
     Returns:
         List of segments in the order they appear in stdout.
@@ -881,7 +886,8 @@ def parse_stdout_segments(stdout: str) -> list[Segment]:
 
     def _flush_text() -> None:
         if text_accum:
-            segments.append(TextSegment(text="\n".join(text_accum)))
+            if include_text:
+                segments.append(TextSegment(text="\n".join(text_accum)))
             text_accum.clear()
 
     def _flush_block() -> None:
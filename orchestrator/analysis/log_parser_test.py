@@ -732,6 +732,23 @@ class TestParseStdoutSegments:
         assert isinstance(segments[2], TextSegment)
         assert segments[2].text == "Test complete."
 
+    def test_include_text_false_yields_blocks_only(self):
+        """include_text=False drops text outside blocks but keeps block logs."""
+        stdout = (
+            "Setting up...\n"
+            '[TST] {"type": "block_start", "block": "rigging"}\n'
+            "inside\n"
+            '[TST] {"type": "feature", "name": "auth"}\n'
+            '[TST] {"type": "block_end", "block": "rigging"}\n'
+            "Test complete."
+        )
+        segments = parse_stdout_segments(stdout, include_text=False)
+        assert len(segments) == 1
+        assert isinstance(segments[0], BlockSegment)
+        assert segments[0].block == "rigging"
+        assert "inside" in segments[0].logs
+        assert parse_stdout_segments("plain only", include_text=False) == []
+
     def test_block_with_plain_logs(self):
         """Plain text inside a block goes to BlockSegment.logs."""
         stdout = (
@@ -1,10 +1,11 @@
 """Test result reporting: JSON and HTML report generation."""
 
 from orchestrator.reporting.html_reporter import generate_html_report, write_html_report
-from orchestrator.reporting.reporter import Reporter
+from orchestrator.reporting.reporter import Reporter, StreamingReporter
 
 __all__ = [
     "Reporter",
+    "StreamingReporter",
     "generate_html_report",
     "write_html_report",
 ]
@@ -6,13 +6,19 @@ expandable log and measurement sections, and visual DAG structure.
 
 from __future__ import annotations
 
+import base64
+import functools
+import gzip
 import html
+import io
 import json
 import re
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
+from urllib.parse import quote
 
 from orchestrator.analysis.log_parser import (
+    SENTINEL,
     BlockSegment,
     StepSegment,
     TextSegment,
@@ -21,6 +27,21 @@ from orchestrator.analysis.log_parser import (
 from orchestrator.reporting.source_links import render_source_link
 
 
+class _FallbackDict(dict[str, str]):
+    """``dict`` whose missing keys read as a fixed fallback value.
+
+    Lets lookup tables with a single default be indexed directly
+    (``table[key]``) instead of through ``table.get(key, default)``.
+    """
+
+    def __init__(self, fallback: str, items: dict[str, str]) -> None:
+        super().__init__(items)
+        self.fallback = fallback
+
+    def __missing__(self, key: str) -> str:
+        return self.fallback
+
+
 # Status color mapping (verdict states + backward-compat aliases)
 STATUS_COLORS: dict[str, str] = {
     # Verdict states
@@ -73,6 +94,94 @@ STATUS_LABELS: dict[str, str] = {
     "not_run": "NOT RUN",
 }
 
+# Fused (color, label) badge tables, one lookup per badge.  Unknown
+# states get the default color and their upper-cased name (see _badge()),
+# computed per call so the tables never change after import.
+_STATUS_BADGE: dict[str, tuple[str, str]] = {
+    s: (STATUS_COLORS.get(s, "#e8e8e8"), STATUS_LABELS.get(s, s.upper()))
+    for s in STATUS_COLORS.keys() | STATUS_LABELS.keys()
+}
+_LIFECYCLE_BADGE: dict[str, tuple[str, str]] = {
+    s: (LIFECYCLE_COLORS.get(s, "#e8e8e8"), LIFECYCLE_LABELS.get(s, s.upper()))
+    for s in LIFECYCLE_COLORS.keys() | LIFECYCLE_LABELS.keys()
+}
+
+# CSS class per assertion status; anything other than "passed" fails
+_ASSERTION_CLASS = _FallbackDict("assertion-fail", {"passed": "assertion-pass"})
+
+
+# Escaped forms of short, frequently repeated values (statuses, labels,
+# commit prefixes).  Cleared when full so adversarial input cannot grow
+# it without bound.
+_ESCAPE_CACHE: dict[str, str] = {}
+_ESCAPE_CACHE_MAX = 4096
+
+
+def _esc(text: str) -> str:
+    """Return ``html.escape(text)``, memoized for repeated values.
+
+    Only use for low-cardinality values; free-form text such as log
+    output, assertion descriptions and test names goes through
+    ``html.escape`` directly.
+    """
+    escaped = _ESCAPE_CACHE.get(text)
+    if escaped is None:
+        if len(_ESCAPE_CACHE) >= _ESCAPE_CACHE_MAX:
+            _ESCAPE_CACHE.clear()
+        escaped = _ESCAPE_CACHE[text] = html.escape(text)
+    return escaped
+
+
+def _badge(table: dict[str, tuple[str, str]], state: str) -> tuple[str, str]:
+    """Return ``(color, label)`` for *state* from a fused badge table."""
+    badge = table.get(state)
+    if badge is None:
+        return "#e8e8e8", state.upper()
+    return badge
+
+
+# Pre-rendered (prefix, suffix) pairs for the header summary items; the
+# count is written between them.
+_SUMMARY_FRAG: dict[str, tuple[str, str]] = {
+    "total": (
+        '<div class="summary-item" style="background:#e8e8e8">Total: ',
+        "</div>\n",
+    ),
+    "success": (
+        '<div class="summary-item" style="background:#90EE90">Success: ',
+        "</div>\n",
+    ),
+    "failed": (
+        '<div class="summary-item" style="background:#FFB6C1">Failed: ',
+        "</div>\n",
+    ),
+    "missing_result": (
+        '<div class="summary-item" style="background:#FFFFAD">'
+        "Missing Result: ",
+        "</div>\n",
+    ),
+    "undecided": (
+        '<div class="summary-item" style="background:#B0C4DE">Undecided: ',
+        "</div>\n",
+    ),
+    "duration": (
+        '<div class="summary-item" style="background:#e8e8e8">Duration: ',
+        "s</div>\n",
+    ),
+}
+
+# Pre-rendered (state, prefix, suffix) triples for lifecycle summary
+# items, in display order; the count is written between prefix and suffix.
+_LIFECYCLE_SUMMARY_FRAG: tuple[tuple[str, str, str], ...] = tuple(
+    (
+        state,
+        f'<span class="lifecycle-summary-item" '
+        f'style="background:{LIFECYCLE_COLORS[state]}">',
+        f" {html.escape(LIFECYCLE_LABELS[state])}</span>\n",
+    )
+    for state in ("stable", "burning_in", "flaky", "new", "disabled")
+)
+
 _CSS = """\
 html, body {
     height: 100%;
@@ -497,9 +606,30 @@ a.source-link:hover {
 """
 
 
+# Static document head and tail, shared by every report.  The byte
+# forms are encoded once at import so write_html_report() does not
+# re-encode the embedded stylesheet for each file it writes.
+_HTML_HEAD = (
+    "<!DOCTYPE html>\n"
+    '<html lang="en">\n'
+    "<head>\n"
+    '<meta charset="UTF-8">\n'
+    '<meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+    "<title>Test Report</title>\n"
+    f"<style>{_CSS}</style>\n"
+    "</head>\n"
+    "<body>\n"
+)
+_HTML_TAIL = "</body>\n</html>"
+_HTML_HEAD_BYTES = _HTML_HEAD.encode("utf-8")
+_HTML_TAIL_BYTES = _HTML_TAIL.encode("utf-8")
+
+
 def generate_html_report(report_data: dict[str, Any]) -> str:
     """Generate a self-contained HTML report from report data.
 
+    All section renderers write into a single ``io.StringIO`` buffer.
+
     Args:
         report_data: Report dict (as produced by Reporter.generate_report()).
                      Expected structure: {"report": {...}}.
@@ -507,55 +637,55 @@ def generate_html_report(report_data: dict[str, Any]) -> str:
     Returns:
         Complete HTML string.
     """
-    report = report_data.get("report", {})
+    out = io.StringIO()
+    out.write(_HTML_HEAD)
+    _render_report_body(out, report_data.get("report", {}))
+    out.write(_HTML_TAIL)
+    return out.getvalue()
+
+
+def _render_report_body(
+    out: io.StringIO,
+    report: dict[str, Any],
+    data_prefix: Path | None = None,
+) -> None:
+    """Render everything between ``<body>`` and ``</body>``.
+
+    ``data_prefix`` is passed through to ``_render_dag_section()``.
+    """
     source_link_base = report.get("source_link_base")
-    parts: list[str] = []
-
-    parts.append("<!DOCTYPE html>")
-    parts.append('<html lang="en">')
-    parts.append("<head>")
-    parts.append('<meta charset="UTF-8">')
-    parts.append('<meta name="viewport" content="width=device-width, initial-scale=1.0">')
-    parts.append("<title>Test Report</title>")
-    parts.append(f"<style>{_CSS}</style>")
-    parts.append("</head>")
-    parts.append("<body>")
 
     # Header
-    parts.append(_render_header(report))
+    _render_header(out, report)
 
     history = report.get("history", {})
     lifecycle_config = report.get("lifecycle_config")
 
     # DAG visualization (only for hierarchical reports)
     if "test_set" in report:
-        parts.append(_render_dag_section(
-            report,
+        _render_dag_section(
+            out, report,
             history=history,
             lifecycle_config=lifecycle_config,
             source_link_base=source_link_base,
-        ))
+            data_prefix=data_prefix,
+        )
 
     # Flat tests (non-hierarchical reports only; hierarchical data is
     # rendered as hidden elements inside the DAG section above)
     if "test_set" not in report and "tests" in report:
-        parts.append(_render_flat_tests(
-            report["tests"], history,
+        _render_flat_tests(
+            out, report["tests"], history,
             source_link_base=source_link_base,
-        ))
+        )
 
     # Hash filter summary section
     if "hash_filter" in report:
-        parts.append(_render_hash_filter_section(report["hash_filter"]))
+        _render_hash_filter_section(out, report["hash_filter"])
 
     # Regression selection section
     if "regression_selection" in report:
-        parts.append(_render_regression_selection(report["regression_selection"]))
-
-    parts.append("</body>")
-    parts.append("</html>")
-
-    return "\n".join(parts)
+        _render_regression_selection(out, report["regression_selection"])
 
 
 def generate_html_from_file(report_path: Path) -> str:
@@ -571,31 +701,46 @@ def generate_html_from_file(report_path: Path) -> str:
         FileNotFoundError: If report file doesn't exist.
         json.JSONDecodeError: If JSON is invalid.
     """
-    with open(report_path) as f:
-        report_data = json.load(f)
+    # json.loads detects the UTF encoding of raw bytes itself, so the
+    # file is not decoded through a separate text layer first.
+    report_data = json.loads(report_path.read_bytes())
     return generate_html_report(report_data)
 
 
 def write_html_report(
-    report_data: dict[str, Any], output_path: Path
+    report_data: dict[str, Any],
+    output_path: Path,
+    *,
+    external_data: bool = False,
 ) -> None:
     """Write HTML report to a file.
 
+    The file is written as UTF-8 in binary mode; the static head and tail
+    are emitted from their pre-encoded forms and only the per-report body
+    is encoded.
+
     Args:
         report_data: Report dict.
         output_path: Path to write the HTML file.
+        external_data: Write the DAG graph data and search index to
+            ``<stem>.graph.js`` and ``<stem>.search.js`` next to the
+            HTML file and load them with ``<script src>``, instead of
+            inlining them.  The report is then no longer self-contained.
     """
-    html_content = generate_html_report(report_data)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w") as f:
-        f.write(html_content)
+    data_prefix = output_path.with_suffix("") if external_data else None
+    body = io.StringIO()
+    _render_report_body(body, report_data.get("report", {}), data_prefix)
+    with open(output_path, "wb") as f:
+        f.write(_HTML_HEAD_BYTES)
+        f.write(body.getvalue().encode("utf-8"))
+        f.write(_HTML_TAIL_BYTES)
 
 
-def _render_header(report: dict[str, Any]) -> str:
+def _render_header(out: io.StringIO, report: dict[str, Any]) -> None:
     """Render the report header with summary."""
-    parts: list[str] = []
-    parts.append('<div class="report-header">')
-    parts.append("<h1>Test Report</h1>")
+    out.write('<div class="report-header">\n')
+    out.write("<h1>Test Report</h1>\n")
 
     meta_parts: list[str] = []
     if "generated_at" in report:
@@ -603,98 +748,86 @@ def _render_header(report: dict[str, Any]) -> str:
     if "commit" in report:
         meta_parts.append(f"Commit: {html.escape(str(report['commit']))}")
     if meta_parts:
-        parts.append(f'<div class="meta">{" | ".join(meta_parts)}</div>')
+        out.write(f'<div class="meta">{" | ".join(meta_parts)}</div>\n')
 
-    parts.append(_render_trigger_context(report))
+    _render_trigger_context(out, report)
 
     summary = report.get("summary", {})
     if summary:
-        parts.append('<div class="summary">')
+        out.write('<div class="summary">\n')
         total = summary.get("total", 0)
         success = summary.get("success", summary.get("passed", 0))
         failed = summary.get("failed", 0)
         duration = summary.get("total_duration_seconds", 0)
 
-        parts.append(
-            f'<div class="summary-item" style="background:#e8e8e8">'
-            f"Total: {total}</div>"
-        )
-        if success:
-            parts.append(
-                f'<div class="summary-item" style="background:#90EE90">'
-                f"Success: {success}</div>"
-            )
-        if failed:
-            parts.append(
-                f'<div class="summary-item" style="background:#FFB6C1">'
-                f"Failed: {failed}</div>"
-            )
         missing = summary.get("missing_result", 0)
-        if missing:
-            parts.append(
-                f'<div class="summary-item" style="background:#FFFFAD">'
-                f"Missing Result: {missing}</div>"
-            )
         undecided = summary.get("undecided", summary.get("not_run", 0))
-        if undecided:
-            parts.append(
-                f'<div class="summary-item" style="background:#B0C4DE">'
-                f"Undecided: {undecided}</div>"
-            )
-        parts.append(
-            f'<div class="summary-item" style="background:#e8e8e8">'
-            f"Duration: {duration:.3f}s</div>"
-        )
-        parts.append("</div>")
-
-    parts.append("</div>")
-    return "\n".join(parts)
 
-
-def _render_trigger_context(report: dict[str, Any]) -> str:
+        for key, value in (
+            ("total", total),
+            ("success", success),
+            ("failed", failed),
+            ("missing_result", missing),
+            ("undecided", undecided),
+        ):
+            if value or key == "total":
+                pre, post = _SUMMARY_FRAG[key]
+                out.write(pre)
+                out.write(str(value))
+                out.write(post)
+        pre, post = _SUMMARY_FRAG["duration"]
+        out.write(pre)
+        out.write(f"{duration:.3f}")
+        out.write(post)
+        out.write("</div>\n")
+
+    out.write("</div>\n")
+
+
+def _render_trigger_context(out: io.StringIO, report: dict[str, Any]) -> None:
     """Render a compact context banner showing how the report was generated."""
-    parts: list[str] = ['<div class="trigger-context">']
+    out.write('<div class="trigger-context">\n')
 
     # Trigger source
     ci_gate = report.get("ci_gate_name")
     test_set_name = report.get("test_set", {}).get("name")
     if ci_gate:
-        parts.append(
+        out.write(
             f'<span class="trigger-label">CI Gate:</span> '
-            f"{html.escape(str(ci_gate))}"
+            f"{html.escape(str(ci_gate))}\n"
         )
     elif test_set_name:
-        parts.append(
+        out.write(
             '<span class="trigger-label">Test Set:</span> '
-            f"{html.escape(str(test_set_name))}"
+            f"{html.escape(str(test_set_name))}\n"
         )
     else:
-        parts.append(
-            '<span class="trigger-label">Direct invocation</span>'
+        out.write(
+            '<span class="trigger-label">Direct invocation</span>\n'
         )
 
     # If we showed ci_gate and there's also a test set, show it too
     if ci_gate and test_set_name:
-        parts.append('<span class="trigger-sep">&middot;</span>')
-        parts.append(
+        out.write('<span class="trigger-sep">&middot;</span>\n')
+        out.write(
             f'<span class="trigger-label">Test Set:</span> '
-            f"{html.escape(str(test_set_name))}"
+            f"{html.escape(str(test_set_name))}\n"
         )
 
     # Execution mode pill
     mode = report.get("execution_mode")
     if mode:
-        parts.append('<span class="trigger-sep">&middot;</span>')
-        parts.append(
-            f'<span class="trigger-pill">{html.escape(mode)}</span>'
+        out.write('<span class="trigger-sep">&middot;</span>\n')
+        out.write(
+            f'<span class="trigger-pill">{html.escape(mode)}</span>\n'
         )
 
     # Effort pill
     effort = report.get("effort", {})
     effort_mode = effort.get("mode") if isinstance(effort, dict) else None
     if effort_mode:
-        parts.append(
-            f'<span class="trigger-pill">effort: {html.escape(effort_mode)}</span>'
+        out.write(
+            f'<span class="trigger-pill">effort: {html.escape(effort_mode)}</span>\n'
         )
 
     # Hash filter pill
@@ -703,63 +836,60 @@ def _render_trigger_context(report: dict[str, Any]) -> str:
         skipped = hf.get("skipped", 0)
         total = hf.get("changed", 0) + hf.get("unchanged", 0)
         if total > 0:
-            parts.append(
+            out.write(
                 f'<span class="trigger-pill">'
-                f"hash-skip: {skipped}/{total}</span>"
+                f"hash-skip: {skipped}/{total}</span>\n"
             )
 
-    parts.append("</div>")
-    return "\n".join(parts)
+    out.write("</div>\n")
 
 
 def _render_test_entry(
+    out: io.StringIO,
     name: str, data: dict[str, Any],
     history_entries: list[dict[str, Any]] | None = None,
     source_link_base: str | None = None,
     *,
     effort_classification: dict[str, Any] | None = None,
     e_value_per_test: dict[str, Any] | None = None,
-) -> str:
+) -> None:
     """Render a single test entry with expandable details."""
-    parts: list[str] = []
     status = data.get("status", "success")
-    color = STATUS_COLORS.get(status, "#e8e8e8")
-    label = STATUS_LABELS.get(status, status.upper())
+    color, label = _badge(_STATUS_BADGE, status)
     duration = data.get("duration_seconds", 0)
     assertion = data.get("assertion", "")
 
-    parts.append(
+    out.write(
         f'<div class="test-entry" style="border-left-color:{color}"'
-        f' data-test-name="{html.escape(name, quote=True)}">'
+        f' data-test-name="{html.escape(name, quote=True)}">\n'
     )
 
-    lifecycle_html = ""
-    lifecycle = data.get("lifecycle")
-    if lifecycle:
-        lifecycle_html = " " + _render_lifecycle_badge(lifecycle)
-
-    parts.append(
+    out.write(
         f'<div class="test-name">{html.escape(name)} '
         f'<span class="status-badge" style="background:{color}">'
-        f"{html.escape(label)}</span>"
-        f"{lifecycle_html}</div>"
+        f"{_esc(label)}</span>"
     )
+    lifecycle = data.get("lifecycle")
+    if lifecycle:
+        out.write(" ")
+        _render_lifecycle_badge(out, lifecycle)
+    out.write("</div>\n")
 
     # Parameters table
     parameters = data.get("parameters")
     if parameters:
-        parts.append('<table class="measurements-table" style="margin-top:6px">')
-        parts.append("<tr><th>Parameter</th><th>Value</th></tr>")
+        out.write('<table class="measurements-table" style="margin-top:6px">\n')
+        out.write("<tr><th>Parameter</th><th>Value</th></tr>\n")
         for key, value in parameters.items():
-            parts.append(
+            out.write(
                 f"<tr><td>{html.escape(str(key))}</td>"
-                f"<td>{html.escape(str(value))}</td></tr>"
+                f"<td>{html.escape(str(value))}</td></tr>\n"
             )
-        parts.append("</table>")
+        out.write("</table>\n")
 
     # History timeline
     if history_entries:
-        parts.append(_render_history_timeline(history_entries))
+        _render_history_timeline(out, history_entries)
 
     meta_items: list[str] = []
     if assertion:
@@ -768,58 +898,68 @@ def _render_test_entry(
     if data.get("exit_code") is not None:
         meta_items.append(f"Exit code: {data['exit_code']}")
     if meta_items:
-        parts.append(f'<div class="test-meta">{" | ".join(meta_items)}</div>')
+        out.write(f'<div class="test-meta">{" | ".join(meta_items)}</div>\n')
 
     # Stdout/stderr logs
     stdout = data.get("stdout", "")
     stderr = data.get("stderr", "")
     if stdout or stderr:
-        parts.append('<div class="log-section">')
+        out.write('<div class="log-section">\n')
         if stdout:
-            segments = parse_stdout_segments(stdout)
-            has_blocks = any(isinstance(s, BlockSegment) for s in segments)
+            # Blocks only come from [TST] sentinel lines, so output
+            # without the sentinel is never parsed.  Otherwise plain
+            # text is only split into separate segments around blocks,
+            # so output without blocks is a single TextSegment and the
+            # check needs no scan of the segment list.
+            segments = (
+                parse_stdout_segments(stdout) if SENTINEL in stdout else []
+            )
+            has_blocks = len(segments) > 1 or (
+                bool(segments) and type(segments[0]) is BlockSegment
+            )
             if has_blocks:
-                parts.append(_render_stdout_segments(
-                    segments, source_link_base=source_link_base,
-                ))
+                _render_stdout_segments(
+                    out, segments, source_link_base=source_link_base,
+                    link_cache={},
+                )
             else:
-                parts.append(f"<pre>{html.escape(stdout)}</pre>")
+                out.write(f"<pre>{html.escape(stdout)}</pre>\n")
         if stderr:
-            parts.append(f'<pre style="border-left:3px solid #FFB6C1">'
-                         f"{html.escape(stderr)}</pre>")
-        parts.append("</div>")
+            out.write(f'<pre style="border-left:3px solid #FFB6C1">'
+                      f"{html.escape(stderr)}</pre>\n")
+        out.write("</div>\n")
 
     # Burn-in progress
     burn_in = data.get("burn_in")
     if burn_in:
-        parts.append(_render_burn_in(burn_in))
+        _render_burn_in(out, burn_in)
 
     # Inferred dependencies
     inferred_deps = data.get("inferred_dependencies")
     if inferred_deps:
-        parts.append(_render_inferred_deps(inferred_deps))
+        _render_inferred_deps(out, inferred_deps)
 
     # Effort classification badge
     if effort_classification:
         cls = effort_classification.get("classification", "")
-        cls_color = _CLASSIFICATION_COLORS.get(cls, "#FFFFFF")
+        cls_color = _CLASSIFICATION_COLORS[cls]
         initial = effort_classification.get("initial_status", "")
         runs = effort_classification.get("runs", 0)
         passes = effort_classification.get("passes", 0)
         sprt = effort_classification.get("sprt_decision", "")
-        parts.append('<div style="margin-top:6px">')
-        parts.append(
+        out.write('<div style="margin-top:6px">\n')
+        out.write(
             f'<strong>Effort:</strong> '
             f'<span class="status-badge" style="background:{cls_color}">'
-            f'{html.escape(cls)}</span>'
+            f'{_esc(cls)}</span>\n'
         )
-        parts.append(
-            f' &mdash; initial: {html.escape(initial)}, '
-            f'{passes}/{runs} passed'
+        out.write(
+            f' &mdash; initial: {_esc(initial)}, '
+            f'{passes}/{runs} passed\n'
         )
         if sprt and sprt != "not_evaluated":
-            parts.append(f', SPRT: {html.escape(sprt)}')
-        parts.append("</div>")
+            out.write(f', SPRT: {_esc(sprt)}\n')
+        out.write("</div>\n")
 
     # E-value evidence
     if e_value_per_test:
@@ -827,32 +967,161 @@ def _render_test_entry(
         runs = e_value_per_test.get("runs", 0)
         passes = e_value_per_test.get("passes", 0)
         commits = e_value_per_test.get("commits_included", 0)
-        parts.append(
+        out.write(
             f'<div style="margin-top:4px">'
             f'<strong>E-value:</strong> S_i = <code>{s_val:.4f}</code>, '
-            f'{runs} runs, {passes} passes, {commits} commits</div>'
+            f'{runs} runs, {passes} passes, {commits} commits</div>\n'
         )
 
-    parts.append("</div>")
-    return "\n".join(parts)
+    out.write("</div>\n")
 
 
 def _render_stdout_segments(
+    out: io.StringIO,
     segments: list[TextSegment | BlockSegment],
     source_link_base: str | None = None,
-) -> str:
-    """Render parsed stdout segments as unified HTML."""
-    parts: list[str] = []
+    link_cache: dict[tuple[Any, Any, str | None], str] | None = None,
+) -> None:
+    """Render parsed stdout segments as unified HTML.
+
+    *link_cache* is shared by every block in the test's output so that
+    source links pointing at the same location are rendered once.
+    """
+    if link_cache is None:
+        link_cache = {}
     for seg in segments:
         if isinstance(seg, TextSegment):
             text = seg.text.strip()
             if text:
-                parts.append(f"<pre>{html.escape(text)}</pre>")
+                out.write(f"<pre>{html.escape(text)}</pre>\n")
         elif isinstance(seg, BlockSegment):
-            parts.append(_render_block_segment(
-                seg, source_link_base=source_link_base,
-            ))
-    return "\n".join(parts)
+            _render_block_segment(
+                out, seg, source_link_base=source_link_base,
+                link_cache=link_cache,
+            )
+
+
+def _cached_source_link(
+    event: dict[str, Any],
+    source_link_base: str | None,
+    link_cache: dict[tuple[Any, Any, str | None], str],
+) -> str:
+    """Return ``render_source_link()`` output memoized by source location.
+
+    Sibling steps often log features, measurements and assertions from
+    the same ``_file``/``_line``, so the rendered link is keyed on that
+    pair and reused within one test entry.  Events without source
+    metadata, the common case, return ``""`` before touching the cache.
+    """
+    file_path = event.get("_file")
+    line_num = event.get("_line")
+    if file_path is None or line_num is None:
+        return ""
+    key = (file_path, line_num, source_link_base)
+    link = link_cache.get(key)
+    if link is None:
+        link = render_source_link(event, source_link_base)
+        link_cache[key] = link
+    return link
+
+
+# Row formatters for measurement tables and assertion lists (bound
+# ``str.format`` methods, so each row skips the attribute lookup)
+_MEASUREMENT_ROW = (
+    "<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>\n"
+).format
+_ASSERTION_ITEM = '<li class="{}">{}{}</li>\n'.format
+_ERROR_DIV = '<div class="block-error">Error: {}{}</div>\n'.format
+
+
+def _render_measurement_table(
+    out: io.StringIO,
+    measurements: list[dict[str, Any]],
+    source_link_base: str | None,
+    link_cache: dict[tuple[Any, Any, str | None], str],
+) -> None:
+    """Render a measurements table, building all rows in one batch."""
+    esc = html.escape
+    rows = [
+        _MEASUREMENT_ROW(
+            esc(str(m.get("name", ""))),
+            esc(str(m.get("value", ""))),
+            esc(str(m.get("unit", ""))),
+            _cached_source_link(m, source_link_base, link_cache),
+        )
+        for m in measurements
+    ]
+    out.write('<table class="measurements-table">\n')
+    out.write(
+        "<tr><th>Name</th><th>Value</th><th>Unit</th><th>Source</th></tr>\n"
+    )
+    out.write("".join(rows))
+    out.write("</table>\n")
+
+
+def _render_assertion_item(
+    assertion: dict[str, Any],
+    source_link_base: str | None,
+    link_cache: dict[tuple[Any, Any, str | None], str],
+) -> str:
+    """Return the ``<li>`` for one assertion, with its source link."""
+    a_get = assertion.get
+    return _ASSERTION_ITEM(
+        _ASSERTION_CLASS[a_get("status", "unknown")],
+        html.escape(str(a_get("description", ""))),
+        _cached_source_link(assertion, source_link_base, link_cache),
+    )
+
+
+def _render_assertion_list(
+    out: io.StringIO,
+    assertions: list[dict[str, Any]],
+    source_link_base: str | None,
+    link_cache: dict[tuple[Any, Any, str | None], str],
+) -> None:
+    """Render an assertion list, building all items in one batch."""
+    items = [
+        _render_assertion_item(a, source_link_base, link_cache)
+        for a in assertions
+    ]
+    out.write('<ul class="assertion-list">\n')
+    out.write("".join(items))
+    out.write("</ul>\n")
+
+
+def _iter_errors(
+    errors: list[Any],
+    source_link_base: str | None,
+    link_cache: dict[tuple[Any, Any, str | None], str],
+) -> Iterator[tuple[str, str]]:
+    """Yield ``(message, source_link)`` for each error with a message.
+
+    Errors are either structured dicts (with optional ``_file``/``_line``)
+    or plain strings, which never carry a source link.
+    """
+    for err in errors:
+        if isinstance(err, dict):
+            msg = err.get("message", "")
+            if msg:
+                yield msg, _cached_source_link(err, source_link_base, link_cache)
+        else:
+            msg = str(err)
+            if msg:
+                yield msg, ""
+
+
+def _render_error_list(
+    out: io.StringIO,
+    errors: list[Any],
+    source_link_base: str | None,
+    link_cache: dict[tuple[Any, Any, str | None], str],
+) -> None:
+    """Render error lines, building all of them in one batch."""
+    esc = html.escape
+    out.write("".join([
+        _ERROR_DIV(esc(msg), link)
+        for msg, link in _iter_errors(errors, source_link_base, link_cache)
+    ]))
 
 
 def _step_should_expand(step: StepSegment) -> bool:
@@ -875,26 +1144,32 @@ _STEP_STATUS_LABELS: dict[str, str] = {
     "failed": "FAILED",
     "warning": "WARNING",
 }
+_STEP_STATUS_BADGE: dict[str, tuple[str, str]] = {
+    s: (_STEP_STATUS_COLORS[s], _STEP_STATUS_LABELS[s])
+    for s in _STEP_STATUS_COLORS
+}
 
 
 def _render_step_segment(
+    out: io.StringIO,
     step: StepSegment,
     source_link_base: str | None = None,
-) -> str:
+    link_cache: dict[tuple[Any, Any, str | None], str] | None = None,
+) -> None:
     """Render a single step as a collapsible HTML element.
 
     Passed steps are collapsed by default; failed and warning steps
     (and their ancestors) are expanded.
     """
+    if link_cache is None:
+        link_cache = {}
     status = step.status
     should_expand = _step_should_expand(step)
     open_attr = " open" if should_expand else ""
-    status_color = _STEP_STATUS_COLORS.get(status, "#e8e8e8")
-    status_label = _STEP_STATUS_LABELS.get(status, status.upper())
+    status_color, status_label = _badge(_STEP_STATUS_BADGE, status)
 
-    parts: list[str] = []
-    parts.append(
-        f'<details class="step-segment step-{html.escape(status)}"{open_attr}>'
+    out.write(
+        f'<details class="step-segment step-{_esc(status)}"{open_attr}>\n'
     )
     substep_indicator = ""
     if step.steps:
@@ -903,15 +1178,15 @@ def _render_step_segment(
             f' <span class="step-substep-count">'
             f'({n} sub-step{"s" if n != 1 else ""})</span>'
         )
-    parts.append(
+    out.write(
         f'<summary class="step-header">'
         f'<span class="step-status-badge" '
         f'style="background:{status_color}">'
-        f'{html.escape(status_label)}</span> '
+        f'{_esc(status_label)}</span> '
         f'{html.escape(step.description)} '
         f'<span class="step-name">{html.escape(step.step)}</span>'
         f'{substep_indicator}'
-        f'</summary>'
+        f'</summary>\n'
     )
 
     # Features
@@ -919,243 +1194,165 @@ def _render_step_segment(
         feat_parts: list[str] = []
         for f in step.features:
             name_html = html.escape(f.get("name", ""))
-            link = render_source_link(f, source_link_base)
+            link = _cached_source_link(f, source_link_base, link_cache)
             feat_parts.append(f"{name_html}{link}")
-        parts.append(
+        out.write(
             f'<div class="block-features">Features: '
-            f'{", ".join(feat_parts)}</div>'
+            f'{", ".join(feat_parts)}</div>\n'
         )
 
     # Measurements table
     if step.measurements:
-        parts.append('<table class="measurements-table">')
-        parts.append(
-            "<tr><th>Name</th><th>Value</th><th>Unit</th><th>Source</th></tr>"
+        _render_measurement_table(
+            out, step.measurements, source_link_base, link_cache,
         )
-        for m in step.measurements:
-            mname = html.escape(str(m.get("name", "")))
-            mval = html.escape(str(m.get("value", "")))
-            munit = html.escape(str(m.get("unit", "")))
-            mlink = render_source_link(m, source_link_base)
-            parts.append(
-                f"<tr><td>{mname}</td><td>{mval}</td>"
-                f"<td>{munit}</td><td>{mlink}</td></tr>"
-            )
-        parts.append("</table>")
 
     # Assertions
     if step.assertions:
-        parts.append('<ul class="assertion-list">')
-        for a in step.assertions:
-            desc = html.escape(str(a.get("description", "")))
-            a_status = a.get("status", "unknown")
-            css_class = (
-                "assertion-pass" if a_status == "passed"
-                else "assertion-fail"
-            )
-            link = render_source_link(a, source_link_base)
-            parts.append(f'<li class="{css_class}">{desc}{link}</li>')
-        parts.append("</ul>")
+        _render_assertion_list(
+            out, step.assertions, source_link_base, link_cache,
+        )
 
     # Errors
-    for err in step.errors:
-        msg = err.get("message", "") if isinstance(err, dict) else str(err)
-        if msg:
-            link = (
-                render_source_link(err, source_link_base)
-                if isinstance(err, dict) else ""
-            )
-            parts.append(
-                f'<div class="block-error">Error: '
-                f'{html.escape(msg)}{link}</div>'
-            )
+    if step.errors:
+        _render_error_list(out, step.errors, source_link_base, link_cache)
 
     # Nested sub-steps
     for sub in step.steps:
-        parts.append(_render_step_segment(sub, source_link_base))
+        _render_step_segment(out, sub, source_link_base, link_cache)
 
     # Raw logs (collapsed)
     if step.logs:
-        parts.append('<details class="log-details">')
-        parts.append("<summary>Raw logs</summary>")
-        parts.append(f"<pre>{html.escape(step.logs)}</pre>")
-        parts.append("</details>")
+        out.write('<details class="log-details">\n')
+        out.write("<summary>Raw logs</summary>\n")
+        out.write(f"<pre>{html.escape(step.logs)}</pre>\n")
+        out.write("</details>\n")
 
-    parts.append("</details>")
-    return "\n".join(parts)
+    out.write("</details>\n")
 
 
 def _render_block_segment(
+    out: io.StringIO,
     block: BlockSegment,
     source_link_base: str | None = None,
-) -> str:
+    link_cache: dict[tuple[Any, Any, str | None], str] | None = None,
+) -> None:
     """Render a single structured block as an HTML card."""
+    if link_cache is None:
+        link_cache = {}
     btype = block.block
-    parts: list[str] = []
-    parts.append(f'<div class="block-segment block-{html.escape(btype)}">')
+    out.write(f'<div class="block-segment block-{_esc(btype)}">\n')
 
     # Header: block type badge + optional description
-    parts.append('<div class="block-header">')
-    parts.append(
-        f'<span class="block-type-badge bt-{html.escape(btype)}">'
-        f"{html.escape(btype)}</span>"
+    out.write('<div class="block-header">\n')
+    out.write(
+        f'<span class="block-type-badge bt-{_esc(btype)}">'
+        f"{_esc(btype)}</span>\n"
     )
     if block.description:
-        parts.append(
+        out.write(
             f'<span class="block-description">'
-            f"{html.escape(block.description)}</span>"
+            f"{html.escape(block.description)}</span>\n"
         )
-    parts.append("</div>")
+    out.write("</div>\n")
 
     # Compute step prefixes for partitioning direct vs step-qualified items
-    step_prefixes = {s.step + "." for s in block.steps}
+    step_prefixes = tuple({s.step + "." for s in block.steps})
 
     # Features
     if block.features:
         if btype == "rigging":
-            parts.append('<div class="block-features">Features:</div>')
-            parts.append('<ul class="block-features-list">')
+            out.write('<div class="block-features">Features:</div>\n')
+            out.write('<ul class="block-features-list">\n')
             for f in block.features:
                 name_html = html.escape(f.get("name", ""))
-                link = render_source_link(f, source_link_base)
-                parts.append(f"<li>{name_html}{link}</li>")
-            parts.append("</ul>")
+                link = _cached_source_link(f, source_link_base, link_cache)
+                out.write(f"<li>{name_html}{link}</li>\n")
+            out.write("</ul>\n")
         else:
             feat_parts: list[str] = []
             for f in block.features:
                 name_html = html.escape(f.get("name", ""))
-                link = render_source_link(f, source_link_base)
+                link = _cached_source_link(f, source_link_base, link_cache)
                 feat_parts.append(f"{name_html}{link}")
-            parts.append(
+            out.write(
                 f'<div class="block-features">Features: '
-                f'{", ".join(feat_parts)}</div>'
+                f'{", ".join(feat_parts)}</div>\n'
             )
 
     # Measurements table (split direct vs step-qualified)
     if block.measurements:
-        direct_m = [
-            m for m in block.measurements
-            if not any(
-                m.get("name", "").startswith(p) for p in step_prefixes
-            )
-        ]
-        step_m = [
-            m for m in block.measurements
-            if any(
-                m.get("name", "").startswith(p) for p in step_prefixes
-            )
-        ]
+        direct_m: list[dict[str, Any]] = []
+        step_m: list[dict[str, Any]] = []
+        if not step_prefixes:
+            direct_m = block.measurements
+        else:
+            for m in block.measurements:
+                if str(m.get("name", "")).startswith(step_prefixes):
+                    step_m.append(m)
+                else:
+                    direct_m.append(m)
         if direct_m:
-            parts.append('<table class="measurements-table">')
-            parts.append(
-                "<tr><th>Name</th><th>Value</th><th>Unit</th>"
-                "<th>Source</th></tr>"
+            _render_measurement_table(
+                out, direct_m, source_link_base, link_cache,
             )
-            for m in direct_m:
-                mname = html.escape(str(m.get("name", "")))
-                mval = html.escape(str(m.get("value", "")))
-                munit = html.escape(str(m.get("unit", "")))
-                mlink = render_source_link(m, source_link_base)
-                parts.append(
-                    f"<tr><td>{mname}</td><td>{mval}</td>"
-                    f"<td>{munit}</td><td>{mlink}</td></tr>"
-                )
-            parts.append("</table>")
         if step_m:
-            parts.append('<details class="log-details">')
-            parts.append(
+            out.write('<details class="log-details">\n')
+            out.write(
                 f"<summary>Sub-step measurements ({len(step_m)})"
-                f"</summary>"
+                f"</summary>\n"
             )
-            parts.append('<table class="measurements-table">')
-            parts.append(
-                "<tr><th>Name</th><th>Value</th><th>Unit</th>"
-                "<th>Source</th></tr>"
+            _render_measurement_table(
+                out, step_m, source_link_base, link_cache,
             )
-            for m in step_m:
-                mname = html.escape(str(m.get("name", "")))
-                mval = html.escape(str(m.get("value", "")))
-                munit = html.escape(str(m.get("unit", "")))
-                mlink = render_source_link(m, source_link_base)
-                parts.append(
-                    f"<tr><td>{mname}</td><td>{mval}</td>"
-                    f"<td>{munit}</td><td>{mlink}</td></tr>"
-                )
-            parts.append("</table>")
-            parts.append("</details>")
+            out.write("</details>\n")
 
     # Assertions (split direct vs step-qualified)
     if block.assertions:
-        direct_a = [
-            a for a in block.assertions
-            if not any(
-                a.get("description", "").startswith(p)
-                for p in step_prefixes
-            )
-        ]
-        step_a = [
-            a for a in block.assertions
-            if any(
-                a.get("description", "").startswith(p)
-                for p in step_prefixes
-            )
-        ]
+        direct_a: list[dict[str, Any]] = []
+        step_a: list[dict[str, Any]] = []
+        if not step_prefixes:
+            direct_a = block.assertions
+        else:
+            for a in block.assertions:
+                if str(a.get("description", "")).startswith(step_prefixes):
+                    step_a.append(a)
+                else:
+                    direct_a.append(a)
         if direct_a:
-            parts.append('<ul class="assertion-list">')
-            for a in direct_a:
-                desc = html.escape(str(a.get("description", "")))
-                status = a.get("status", "unknown")
-                css_class = (
-                    "assertion-pass" if status == "passed"
-                    else "assertion-fail"
-                )
-                link = render_source_link(a, source_link_base)
-                parts.append(f'<li class="{css_class}">{desc}{link}</li>')
-            parts.append("</ul>")
+            _render_assertion_list(
+                out, direct_a, source_link_base, link_cache,
+            )
         if step_a:
-            parts.append('<details class="log-details">')
-            parts.append(
-                f"<summary>Sub-step checks ({len(step_a)})</summary>"
+            out.write('<details class="log-details">\n')
+            out.write(
+                f"<summary>Sub-step checks ({len(step_a)})</summary>\n"
             )
-            parts.append('<ul class="assertion-list">')
-            for a in step_a:
-                desc = html.escape(str(a.get("description", "")))
-                status = a.get("status", "unknown")
-                css_class = (
-                    "assertion-pass" if status == "passed"
-                    else "assertion-fail"
-                )
-                link = render_source_link(a, source_link_base)
-                parts.append(f'<li class="{css_class}">{desc}{link}</li>')
-            parts.append("</ul>")
-            parts.append("</details>")
+            _render_assertion_list(
+                out, step_a, source_link_base, link_cache,
+            )
+            out.write("</details>\n")
 
     # Steps (rendered as nested collapsible sections)
     for step in block.steps:
-        parts.append(_render_step_segment(step, source_link_base))
+        _render_step_segment(out, step, source_link_base, link_cache)
 
     # Block logs (raw timeline -- collapsed by default)
     if block.logs:
-        parts.append('<details class="log-details">')
-        parts.append("<summary>Raw logs</summary>")
-        parts.append(f"<pre>{html.escape(block.logs)}</pre>")
-        parts.append("</details>")
+        out.write('<details class="log-details">\n')
+        out.write("<summary>Raw logs</summary>\n")
+        out.write(f"<pre>{html.escape(block.logs)}</pre>\n")
+        out.write("</details>\n")
 
     # Errors
-    for err in block.errors:
-        msg = err.get("message", "") if isinstance(err, dict) else str(err)
-        if msg:
-            link = render_source_link(err, source_link_base) if isinstance(err, dict) else ""
-            parts.append(
-                f'<div class="block-error">Error: {html.escape(msg)}{link}</div>'
-            )
+    if block.errors:
+        _render_error_list(out, block.errors, source_link_base, link_cache)
 
-    parts.append("</div>")
-    return "\n".join(parts)
+    out.write("</div>\n")
 
 
 # History timeline status-to-color mapping (verdict + backward-compat)
-_TIMELINE_COLORS: dict[str, str] = {
+_TIMELINE_COLORS: dict[str, str] = _FallbackDict("#999", {
     # Verdict states
     "success": "#2da44e",
     "failed": "#cf222e",
@@ -1168,10 +1365,40 @@ _TIMELINE_COLORS: dict[str, str] = {
     "failed+dependencies_failed": "#cf222e",
     "mixed": "#d4a72c",
     "no_tests": "#999",
-}
+})
+
+
+# %-format templates for the history timeline's commit groups and boxes
+_HT_COMMIT_TMPL = '<div class="ht-commit %s"%s>\n'
+_HT_TITLE_TMPL = ' title="%s"'
+# Opening markup of a timeline box per status, up to the tooltip text
+_HT_PREFIX: dict[str, str] = _FallbackDict(
+    '<div class="ht-box" style="background:#999" title="',
+    {
+        s: f'<div class="ht-box" style="background:{c}" title="'
+        for s, c in _TIMELINE_COLORS.items()
+    },
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _ht_box_html(status: str, commit12: str) -> str:
+    """Return the timeline box for a status and 12-char commit prefix.
 
+    The box is a pure function of these two values, which repeat heavily
+    across entries and tests, so the rendered markup is cached.
+    """
+    tooltip = html.escape(commit12) if commit12 else html.escape(status)
+    return _HT_PREFIX[status] + tooltip + '"></div>\n'
+
+
+# Alternating wrapper classes for consecutive commit groups
+_HT_COMMIT_CLASSES = ("ht-commit-a", "ht-commit-b")
 
-def _render_history_timeline(entries: list[dict[str, Any]]) -> str:
+
+def _render_history_timeline(
+    out: io.StringIO, entries: list[dict[str, Any]],
+) -> None:
     """Render a compact horizontal pass/fail history timeline.
 
     Each entry becomes a small colored box.  Consecutive entries that
@@ -1183,7 +1410,7 @@ def _render_history_timeline(entries: list[dict[str, Any]]) -> str:
     right).
     """
     if not entries:
-        return ""
+        return
 
     # Group consecutive entries by commit identity.
     groups: list[tuple[str, list[dict[str, Any]]]] = []
@@ -1195,132 +1422,138 @@ def _render_history_timeline(entries: list[dict[str, Any]]) -> str:
         groups[-1][1].append(entry)
         prev_commit = commit
 
-    parts: list[str] = []
-    parts.append('<div class="history-timeline">')
+    out.write('<div class="history-timeline">\n')
     for idx, (commit_key, group) in enumerate(groups):
-        cls = "ht-commit-a" if idx % 2 == 0 else "ht-commit-b"
-        commit_tip = html.escape(commit_key[:12]) if commit_key else ""
-        title_attr = f' title="{commit_tip}"' if commit_tip else ""
-        parts.append(f'<div class="ht-commit {cls}"{title_attr}>')
+        cls = _HT_COMMIT_CLASSES[idx & 1]
+        commit_tip = _esc(commit_key[:12]) if commit_key else ""
+        title_attr = _HT_TITLE_TMPL % commit_tip if commit_tip else ""
+        out.write(_HT_COMMIT_TMPL % (cls, title_attr))
+        boxes: list[str] = []
         for entry in group:
-            status = entry.get("status", "success")
-            color = _TIMELINE_COLORS.get(status, "#999")
-            entry_commit = entry.get("commit", "")
-            tooltip = (
-                html.escape(entry_commit[:12])
-                if entry_commit
-                else html.escape(status)
-            )
-            parts.append(
-                f'<div class="ht-box" style="background:{color}" '
-                f'title="{tooltip}"></div>'
-            )
-        parts.append("</div>")
-    parts.append("</div>")
-    return "\n".join(parts)
+            e_get = entry.get
+            boxes.append(_ht_box_html(
+                e_get("status", "success"), (e_get("commit", "") or "")[:12],
+            ))
+        out.write("".join(boxes))
+        out.write("</div>\n")
+    out.write("</div>\n")
 
 
-def _render_burn_in(burn_in: dict[str, Any]) -> str:
+def _render_burn_in(out: io.StringIO, burn_in: dict[str, Any]) -> None:
     """Render burn-in progress information."""
     runs = burn_in.get("runs", 0)
     passes = burn_in.get("passes", 0)
     sprt_status = burn_in.get("sprt_status", "unknown")
-    return (
+    out.write(
         f'<div class="burn-in-info">'
         f"Burn-in: {runs} runs, {passes} passes, "
-        f"SPRT: {html.escape(sprt_status)}</div>"
+        f"SPRT: {_esc(sprt_status)}</div>\n"
     )
 
 
-def _render_inferred_deps(deps: list[dict[str, Any]]) -> str:
+def _render_inferred_deps(
+    out: io.StringIO, deps: list[dict[str, Any]],
+) -> None:
     """Render inferred dependencies section."""
-    parts: list[str] = []
-    parts.append('<div class="log-section">')
-    parts.append('<div class="log-section-label">Inferred Dependencies</div>')
-    parts.append("<ul>")
+    out.write('<div class="log-section">\n')
+    out.write('<div class="log-section-label">Inferred Dependencies</div>\n')
+    out.write("<ul>\n")
     for dep in deps:
         dep_str = html.escape(str(dep.get("name", dep)))
-        parts.append(f"<li>{dep_str}</li>")
-    parts.append("</ul>")
-    parts.append("</div>")
-    return "\n".join(parts)
+        out.write(f"<li>{dep_str}</li>\n")
+    out.write("</ul>\n")
+    out.write("</div>\n")
 
 
-def _render_lifecycle_badge(lifecycle: dict[str, Any]) -> str:
+def _render_lifecycle_badge(
+    out: io.StringIO, lifecycle: dict[str, Any],
+) -> None:
     """Render a lifecycle state badge with reliability rate."""
     state = lifecycle.get("state", "new")
-    color = LIFECYCLE_COLORS.get(state, "#e8e8e8")
-    label = LIFECYCLE_LABELS.get(state, state.upper())
+    color, label = _badge(_LIFECYCLE_BADGE, state)
     runs = lifecycle.get("runs", 0)
     passes = lifecycle.get("passes", 0)
     reliability = lifecycle.get("reliability", 0.0)
 
-    parts: list[str] = []
-    parts.append(
+    out.write(
         f'<span class="lifecycle-badge" style="background:{color}">'
-        f"{html.escape(label)}</span>"
+        f"{_esc(label)}</span>"
     )
     if runs > 0:
         pct = f"{reliability * 100:.1f}%"
-        parts.append(
+        out.write(
             f'<span class="lifecycle-reliability">'
             f"{html.escape(pct)} ({passes}/{runs})</span>"
         )
-    return "".join(parts)
 
 
 def _render_lifecycle_summary(
+    out: io.StringIO,
     summary: dict[str, Any],
     config: dict[str, Any] | None = None,
-) -> str:
+) -> None:
     """Render a lifecycle summary for a test set node."""
-    parts: list[str] = []
-    parts.append('<div class="lifecycle-summary">')
+    out.write('<div class="lifecycle-summary">\n')
 
-    for state_name in ("stable", "burning_in", "flaky", "new", "disabled"):
+    for state_name, pre, post in _LIFECYCLE_SUMMARY_FRAG:
         count = summary.get(state_name, 0)
         if count > 0:
-            color = LIFECYCLE_COLORS.get(state_name, "#e8e8e8")
-            label = LIFECYCLE_LABELS.get(state_name, state_name.upper())
-            parts.append(
-                f'<span class="lifecycle-summary-item" '
-                f'style="background:{color}">'
-                f"{count} {html.escape(label)}</span>"
-            )
+            out.write(pre)
+            out.write(str(count))
+            out.write(post)
 
     agg_runs = summary.get("aggregate_runs", 0)
     agg_passes = summary.get("aggregate_passes", 0)
     agg_reliability = summary.get("aggregate_reliability", 0.0)
     if agg_runs > 0:
         pct = f"{agg_reliability * 100:.1f}%"
-        parts.append(
+        out.write(
             f'<span class="lifecycle-reliability">'
             f"Reliability: {html.escape(pct)} ({agg_passes}/{agg_runs})"
-            f"</span>"
+            f"</span>\n"
         )
 
-    parts.append("</div>")
+    out.write("</div>\n")
 
     if config:
         min_rel = config.get("min_reliability", 0)
         sig = config.get("statistical_significance", 0)
-        parts.append(
+        out.write(
             f'<div class="lifecycle-config-note">'
             f"Threshold: {min_rel*100:.0f}% reliability "
-            f"at {sig*100:.0f}% confidence</div>"
+            f"at {sig*100:.0f}% confidence</div>\n"
         )
 
-    return "\n".join(parts)
-
 
 def _collect_test_names(test_set: dict[str, Any]) -> list[str]:
-    """Recursively collect all test names from a test set."""
-    names = list(test_set.get("tests", {}).keys())
-    for subset in test_set.get("subsets", []):
-        names.extend(_collect_test_names(subset))
+    """Collect all test names from a test set and its nested subsets.
+
+    Walks the tree with an explicit stack, so deeply nested sets cannot
+    exhaust the recursion limit. Subsets are pushed in reverse to keep
+    the depth-first, declaration-order result of the recursive walk.
+    """
+    names: list[str] = []
+    stack = [test_set]
+    while stack:
+        ts = stack.pop()
+        names.extend(ts.get("tests", {}))
+        stack.extend(reversed(ts.get("subsets", ())))
     return names
 
 
+# Status classes for _compute_set_history; anything unlisted is neutral
+_HISTORY_FAILED = 1
+_HISTORY_GREY = 2
+_HISTORY_STATUS_CLASS: dict[str, int] = {
+    "failed": _HISTORY_FAILED,
+    "failed+dependencies_failed": _HISTORY_FAILED,
+    "dependencies_failed": _HISTORY_GREY,
+    "no_tests": _HISTORY_GREY,
+    "missing_result": _HISTORY_GREY,
+    "undecided": _HISTORY_GREY,
+}
+
+
 def _compute_set_history(
     test_names: list[str],
     history: dict[str, list[dict[str, Any]]],
@@ -1332,6 +1565,9 @@ def _compute_set_history(
     status is: failed if any test failed, dependencies_failed if all
     grey, passed otherwise.  Tests added later simply have shorter
     histories and are skipped for earlier positions.
+
+    Each test's history is walked once, folding its statuses into
+    per-position flags, rather than revisiting every test per position.
     """
     if not test_names or not history:
         return []
@@ -1343,44 +1579,39 @@ def _compute_set_history(
     if max_len == 0:
         return []
 
-    _FAILED_STATUSES = frozenset({
-        "failed", "failed+dependencies_failed",
-    })
-    _GREY_STATUSES = frozenset({
-        "dependencies_failed", "no_tests",
-        "missing_result", "undecided",
-    })
+    any_failed = [False] * max_len
+    all_grey = [True] * max_len
+    commits: list[str | None] = [None] * max_len
+    status_class = _HISTORY_STATUS_CLASS.get
+    for name in test_names:
+        for i, entry in enumerate(history.get(name, ())):
+            cls = status_class(entry.get("status", "success"), 0)
+            if cls != _HISTORY_GREY:
+                all_grey[i] = False
+                if cls == _HISTORY_FAILED:
+                    any_failed[i] = True
+            if commits[i] is None:
+                commits[i] = entry.get("commit")
 
     result: list[dict[str, Any]] = []
-    for i in range(max_len):
-        statuses: list[str] = []
-        commit: str | None = None
-        for name in test_names:
-            entries = history.get(name, [])
-            if i < len(entries):
-                statuses.append(entries[i].get("status", "success"))
-                if commit is None:
-                    commit = entries[i].get("commit")
-
-        if not statuses:
-            continue
-
-        if any(s in _FAILED_STATUSES for s in statuses):
+    for failed, grey, commit in zip(any_failed, all_grey, commits):
+        if failed:
             agg = "failed"
-        elif all(s in _GREY_STATUSES for s in statuses):
+        elif grey:
             agg = "dependencies_failed"
         else:
             agg = "success"
 
-        entry: dict[str, Any] = {"status": agg}
+        run_entry: dict[str, Any] = {"status": agg}
         if commit:
-            entry["commit"] = commit
-        result.append(entry)
+            run_entry["commit"] = commit
+        result.append(run_entry)
 
     return result
 
 
 def _render_set_summary_card(
+    out: io.StringIO,
     test_set: dict[str, Any],
     lifecycle_config: dict[str, Any] | None = None,
     history_entries: list[dict[str, Any]] | None = None,
@@ -1388,7 +1619,7 @@ def _render_set_summary_card(
     e_value_verdict: dict[str, Any] | None = None,
     effort_data: dict[str, Any] | None = None,
     ci_gate_name: str | None = None,
-) -> str:
+) -> None:
     """Render a hidden summary card for the DAG detail pane.
 
     The card carries a ``data-set-name`` attribute so the JavaScript
@@ -1398,53 +1629,51 @@ def _render_set_summary_card(
     name = test_set.get("name", "Test Set")
     status = test_set.get("status", "success")
     assertion = test_set.get("assertion", "")
-    color = STATUS_COLORS.get(status, "#e8e8e8")
-    label = STATUS_LABELS.get(status, status.upper())
+    color, label = _badge(_STATUS_BADGE, status)
 
-    parts: list[str] = []
-    parts.append(
+    out.write(
         f'<div data-set-name="{html.escape(name, quote=True)}"'
-        f' style="display:none">'
+        f' style="display:none">\n'
     )
-    parts.append('<div class="test-set-header">')
-    parts.append(f"<h2>{html.escape(name)}</h2>")
-    parts.append(
+    out.write('<div class="test-set-header">\n')
+    out.write(f"<h2>{html.escape(name)}</h2>\n")
+    out.write(
         f'<span class="status-badge" style="background:{color}">'
-        f"{html.escape(label)}</span>"
+        f"{_esc(label)}</span>\n"
     )
-    parts.append("</div>")
+    out.write("</div>\n")
 
     if assertion:
-        parts.append(
-            f'<div class="test-meta">Assertion: {html.escape(assertion)}</div>'
+        out.write(
+            f'<div class="test-meta">Assertion: {html.escape(assertion)}</div>\n'
         )
 
     lifecycle_summary = test_set.get("lifecycle_summary")
     if lifecycle_summary:
-        parts.append(_render_lifecycle_summary(lifecycle_summary, lifecycle_config))
+        _render_lifecycle_summary(out, lifecycle_summary, lifecycle_config)
 
     if history_entries:
-        parts.append(_render_history_timeline(history_entries))
+        _render_history_timeline(out, history_entries)
 
     # Inline e-value verdict on the root test_set (the one directly under the executing gate)
     if e_value_verdict:
-        parts.append(_render_inline_e_value_verdict(e_value_verdict))
+        _render_inline_e_value_verdict(out, e_value_verdict)
 
     # Inline effort summary
     if effort_data:
-        parts.append(_render_inline_effort_summary(effort_data))
+        _render_inline_effort_summary(out, effort_data)
 
-    parts.append("</div>")
-    return "\n".join(parts)
+    out.write("</div>\n")
 
 
 def _render_ci_gate_card(
+    out: io.StringIO,
     node: dict[str, Any],
     *,
     e_value_verdict: dict[str, Any] | None = None,
     effort_data: dict[str, Any] | None = None,
     ci_gate_name: str | None = None,
-) -> str:
+) -> None:
     """Render a hidden detail card for a ci_gate DAG node.
 
     The card carries a ``data-ci-gate-name`` attribute so the JavaScript
@@ -1452,29 +1681,27 @@ def _render_ci_gate_card(
     """
     name = node.get("name", "CI Gate")
     status = node.get("status", "undecided")
-    color = STATUS_COLORS.get(status, "#e8e8e8")
-    label = STATUS_LABELS.get(status, status.upper())
+    color, label = _badge(_STATUS_BADGE, status)
     params = node.get("ci_gate_params", {})
     is_executing = ci_gate_name is not None and name == ci_gate_name
 
-    parts: list[str] = []
-    parts.append(
+    out.write(
         f'<div data-ci-gate-name="{html.escape(name, quote=True)}"'
-        f' style="display:none">'
+        f' style="display:none">\n'
     )
-    parts.append('<div class="test-set-header">')
-    parts.append(f"<h2>{html.escape(name)}</h2>")
-    parts.append(
+    out.write('<div class="test-set-header">\n')
+    out.write(f"<h2>{html.escape(name)}</h2>\n")
+    out.write(
         f'<span class="status-badge" style="background:{color}">'
-        f"{html.escape(label)}</span>"
+        f"{_esc(label)}</span>\n"
     )
-    parts.append("</div>")
+    out.write("</div>\n")
 
     # Execution parameters table
     if params:
-        parts.append("<h3>Execution Parameters</h3>")
-        parts.append('<table class="measurements-table">')
-        parts.append("<tr><th>Parameter</th><th>Value</th></tr>")
+        out.write("<h3>Execution Parameters</h3>\n")
+        out.write('<table class="measurements-table">\n')
+        out.write("<tr><th>Parameter</th><th>Value</th></tr>\n")
         for pname, pinfo in sorted(params.items()):
             val = pinfo.get("value", "")
             is_default = pinfo.get("is_default", True)
@@ -1482,38 +1709,38 @@ def _render_ci_gate_card(
             suffix = ""
             if is_default:
                 suffix = ' <span style="color:#999;font-size:0.85em">(default)</span>'
-            parts.append(
-                f"<tr><td>{html.escape(str(pname))}</td>"
-                f"<td{style}>{html.escape(str(val))}{suffix}</td></tr>"
+            out.write(
+                f"<tr><td>{_esc(str(pname))}</td>"
+                f"<td{style}>{html.escape(str(val))}{suffix}</td></tr>\n"
             )
-        parts.append("</table>")
+        out.write("</table>\n")
 
     # E-value verdict (only for the executing gate)
     if is_executing and e_value_verdict:
-        parts.append(_render_inline_e_value_verdict(e_value_verdict))
+        _render_inline_e_value_verdict(out, e_value_verdict)
 
     # Effort summary (only for the executing gate)
     if is_executing and effort_data:
-        parts.append(_render_inline_effort_summary(effort_data))
+        _render_inline_effort_summary(out, effort_data)
 
-    parts.append("</div>")
-    return "\n".join(parts)
+    out.write("</div>\n")
 
 
-def _render_inline_e_value_verdict(verdict_data: dict[str, Any]) -> str:
+def _render_inline_e_value_verdict(
+    out: io.StringIO, verdict_data: dict[str, Any],
+) -> None:
     """Render e-value verdict inline within a detail card."""
-    parts: list[str] = []
-    parts.append("<h3>E-value Verdict</h3>")
+    out.write("<h3>E-value Verdict</h3>\n")
 
     verdict = verdict_data.get("verdict", "UNDECIDED")
-    color = _VERDICT_COLORS.get(verdict, "#FFFFAD")
-    parts.append(
+    color = _VERDICT_COLORS[verdict]
+    out.write(
         f'<span class="verdict-badge" style="background:{color};'
         f'padding:2px 8px;border-radius:4px">'
-        f"{html.escape(verdict)}</span>"
+        f"{_esc(verdict)}</span>\n"
     )
 
-    parts.append('<div style="margin-top:6px">')
+    out.write('<div style="margin-top:6px">\n')
     e_set = verdict_data.get("e_set", 0)
     red_thresh = verdict_data.get("red_threshold", 0)
     min_s = verdict_data.get("min_s_value", 0)
@@ -1521,65 +1748,65 @@ def _render_inline_e_value_verdict(verdict_data: dict[str, Any]) -> str:
     n_tests = verdict_data.get("n_tests", 0)
     weakest = verdict_data.get("weakest_test", "")
 
-    parts.append(
+    out.write(
         f"<strong>Tests:</strong> {n_tests}<br>"
         f"<strong>RED:</strong> "
         f"<code>E_set = {e_set:.4f}</code> "
         f"(threshold: <code>{red_thresh:.4f}</code>)<br>"
         f"<strong>GREEN:</strong> "
         f"<code>min(S_i) = {min_s:.4f}</code> "
-        f"(threshold: <code>{green_thresh:.4f}</code>)"
+        f"(threshold: <code>{green_thresh:.4f}</code>)\n"
     )
 
     if weakest:
-        parts.append(f"<br><strong>Weakest:</strong> {html.escape(str(weakest))}")
+        out.write(f"<br><strong>Weakest:</strong> {html.escape(str(weakest))}\n")
 
     total_reruns = verdict_data.get("total_reruns")
     if total_reruns is not None:
-        parts.append(f"<br><strong>HiFi reruns:</strong> {total_reruns}")
+        out.write(f"<br><strong>HiFi reruns:</strong> {total_reruns}\n")
 
-    parts.append("</div>")
+    out.write("</div>\n")
 
     # Per-test E-value table
     per_test = verdict_data.get("per_test", [])
     if per_test:
-        parts.append("<details>")
-        parts.append(f"<summary>Per-test E-values ({len(per_test)})</summary>")
-        parts.append('<table class="measurements-table">')
-        parts.append(
+        out.write("<details>\n")
+        out.write(f"<summary>Per-test E-values ({len(per_test)})</summary>\n")
+        out.write('<table class="measurements-table">\n')
+        out.write(
             "<tr><th>Test</th><th>E_i</th><th>S_i</th>"
-            "<th>Runs</th><th>Passes</th><th>Commits</th></tr>"
+            "<th>Runs</th><th>Passes</th><th>Commits</th></tr>\n"
         )
         for tv in per_test:
-            tname = html.escape(str(tv.get("test_name", "")))
-            e_val = tv.get("e_value", 0)
-            s_val = tv.get("s_value", 0)
-            runs = tv.get("runs", 0)
-            passes = tv.get("passes", 0)
-            commits = tv.get("commits_included", 0)
-            parts.append(
+            tv_get = tv.get
+            tname = html.escape(str(tv_get("test_name", "")))
+            e_val = tv_get("e_value", 0)
+            s_val = tv_get("s_value", 0)
+            runs = tv_get("runs", 0)
+            passes = tv_get("passes", 0)
+            commits = tv_get("commits_included", 0)
+            out.write(
                 f"<tr><td>{tname}</td><td>{e_val:.4f}</td>"
                 f"<td>{s_val:.4f}</td><td>{runs}</td>"
-                f"<td>{passes}</td><td>{commits}</td></tr>"
+                f"<td>{passes}</td><td>{commits}</td></tr>\n"
             )
-        parts.append("</table>")
-        parts.append("</details>")
+        out.write("</table>\n")
+        out.write("</details>\n")
 
-    return "\n".join(parts)
 
-
-def _render_inline_effort_summary(effort_data: dict[str, Any]) -> str:
+def _render_inline_effort_summary(
+    out: io.StringIO, effort_data: dict[str, Any],
+) -> None:
     """Render effort summary inline within a detail card."""
-    parts: list[str] = []
-    parts.append("<h3>Effort Classification</h3>")
+    out.write("<h3>Effort Classification</h3>\n")
 
     mode = effort_data.get("mode", "")
     total_reruns = effort_data.get("total_reruns", 0)
     max_reruns = effort_data.get("max_reruns_per_test", 0)
-    parts.append(
+    out.write(
         f"<strong>Mode:</strong> {html.escape(str(mode))}<br>"
         f"<strong>Total reruns:</strong> {total_reruns} "
-        f"(budget: {max_reruns} per test)<br>"
+        f"(budget: {max_reruns} per test)<br>\n"
     )
 
     classifications = effort_data.get("classifications", {})
@@ -1589,61 +1816,59 @@ def _render_inline_effort_summary(effort_data: dict[str, Any]) -> str:
             cls = c.get("classification", "unknown")
             counts[cls] = counts.get(cls, 0) + 1
         summary_parts = [f"{count} {cls}" for cls, count in sorted(counts.items())]
-        parts.append(f"<strong>Summary:</strong> {', '.join(summary_parts)}<br>")
+        out.write(f"<strong>Summary:</strong> {', '.join(summary_parts)}<br>\n")
 
     burn_in_sweep = effort_data.get("burn_in_sweep")
     if burn_in_sweep:
         sweep_total = burn_in_sweep.get("total_runs", 0)
         decided = burn_in_sweep.get("decided", {})
         undecided = burn_in_sweep.get("undecided", [])
-        parts.append(
+        out.write(
             f"<br><strong>Burn-in sweep:</strong> {sweep_total} runs, "
-            f"{len(decided)} decided, {len(undecided)} still burning in"
+            f"{len(decided)} decided, {len(undecided)} still burning in\n"
         )
 
-    return "\n".join(parts)
-
 
 def _render_flat_tests(
+    out: io.StringIO,
     tests: list[dict[str, Any]],
     history: dict[str, list[dict[str, Any]]],
     source_link_base: str | None = None,
-) -> str:
+) -> None:
     """Render a flat (non-hierarchical) test list."""
-    parts: list[str] = []
-    parts.append('<div class="flat-tests">')
-    parts.append("<h2>Test Results</h2>")
+    out.write('<div class="flat-tests">\n')
+    out.write("<h2>Test Results</h2>\n")
     for test in tests:
         name = test.get("name", "unknown")
-        parts.append(_render_test_entry(
-            name, test, history.get(name, []),
+        _render_test_entry(
+            out, name, test, history.get(name, []),
             source_link_base=source_link_base,
-        ))
-    parts.append("</div>")
-    return "\n".join(parts)
+        )
+    out.write("</div>\n")
 
 
-_VERDICT_COLORS: dict[str, str] = {
+_VERDICT_COLORS: dict[str, str] = _FallbackDict("#FFFFAD", {
     "GREEN": "#90EE90",
     "RED": "#FFB6C1",
     "UNDECIDED": "#FFFFAD",
-}
+})
 
 
-def _render_e_value_verdict(verdict_data: dict[str, Any]) -> str:
+def _render_e_value_verdict(
+    out: io.StringIO, verdict_data: dict[str, Any],
+) -> None:
     """Render E-value test set verdict section."""
-    parts: list[str] = []
-    parts.append('<div class="e-value-verdict">')
-    parts.append("<h2>Test Set Verdict (E-values)</h2>")
+    out.write('<div class="e-value-verdict">\n')
+    out.write("<h2>Test Set Verdict (E-values)</h2>\n")
 
     verdict = verdict_data.get("verdict", "UNDECIDED")
-    color = _VERDICT_COLORS.get(verdict, "#FFFFAD")
-    parts.append(
+    color = _VERDICT_COLORS[verdict]
+    out.write(
         f'<div class="verdict-badge" style="background:{color}">'
-        f"{html.escape(verdict)}</div>"
+        f"{_esc(verdict)}</div>\n"
     )
 
-    parts.append('<div class="e-value-stats">')
+    out.write('<div class="e-value-stats">\n')
     e_set = verdict_data.get("e_set", 0)
     red_thresh = verdict_data.get("red_threshold", 0)
     min_s = verdict_data.get("min_s_value", 0)
@@ -1651,108 +1876,109 @@ def _render_e_value_verdict(verdict_data: dict[str, Any]) -> str:
     n_tests = verdict_data.get("n_tests", 0)
     weakest = verdict_data.get("weakest_test", "")
 
-    parts.append(
+    out.write(
         f"<strong>Tests evaluated:</strong> {n_tests}<br>"
         f"<strong>RED evidence:</strong> "
         f"<code>E_set = {e_set:.4f}</code> "
         f"(threshold: <code>{red_thresh:.4f}</code>)<br>"
         f"<strong>GREEN evidence:</strong> "
         f"<code>min(S_i) = {min_s:.4f}</code> "
-        f"(threshold: <code>{green_thresh:.4f}</code>)"
+        f"(threshold: <code>{green_thresh:.4f}</code>)\n"
     )
 
     if weakest:
-        parts.append(f"<br><strong>Weakest test:</strong> {html.escape(str(weakest))}")
+        out.write(f"<br><strong>Weakest test:</strong> {html.escape(str(weakest))}\n")
 
     total_reruns = verdict_data.get("total_reruns")
     if total_reruns is not None:
-        parts.append(f"<br><strong>HiFi reruns:</strong> {total_reruns}")
+        out.write(f"<br><strong>HiFi reruns:</strong> {total_reruns}\n")
 
-    parts.append("</div>")
+    out.write("</div>\n")
 
     # Per-test E-value table
     per_test = verdict_data.get("per_test", [])
     if per_test:
-        parts.append("<details>")
-        parts.append(f"<summary>Per-test E-values ({len(per_test)})</summary>")
-        parts.append('<table class="measurements-table">')
-        parts.append(
+        out.write("<details>\n")
+        out.write(f"<summary>Per-test E-values ({len(per_test)})</summary>\n")
+        out.write('<table class="measurements-table">\n')
+        out.write(
             "<tr><th>Test</th><th>E_i</th><th>S_i</th>"
-            "<th>Runs</th><th>Passes</th><th>Commits</th></tr>"
+            "<th>Runs</th><th>Passes</th><th>Commits</th></tr>\n"
         )
         for tv in per_test:
-            tname = html.escape(str(tv.get("test_name", "")))
-            e_val = tv.get("e_value", 0)
-            s_val = tv.get("s_value", 0)
-            runs = tv.get("runs", 0)
-            passes = tv.get("passes", 0)
-            commits = tv.get("commits_included", 0)
-            parts.append(
+            tv_get = tv.get
+            tname = html.escape(str(tv_get("test_name", "")))
+            e_val = tv_get("e_value", 0)
+            s_val = tv_get("s_value", 0)
+            runs = tv_get("runs", 0)
+            passes = tv_get("passes", 0)
+            commits = tv_get("commits_included", 0)
+            out.write(
                 f"<tr><td>{tname}</td><td>{e_val:.4f}</td>"
                 f"<td>{s_val:.4f}</td><td>{runs}</td>"
-                f"<td>{passes}</td><td>{commits}</td></tr>"
+                f"<td>{passes}</td><td>{commits}</td></tr>\n"
             )
-        parts.append("</table>")
-        parts.append("</details>")
+        out.write("</table>\n")
+        out.write("</details>\n")
 
-    parts.append("</div>")
-    return "\n".join(parts)
+    out.write("</div>\n")
 
 
-_CLASSIFICATION_COLORS: dict[str, str] = {
+_CLASSIFICATION_COLORS: dict[str, str] = _FallbackDict("#FFFFFF", {
     "true_pass": "#90EE90",
     "true_fail": "#FFB6C1",
     "flake": "#FFFFAD",
     "undecided": "#D3D3D3",
-}
+})
 
 
-def _render_hash_filter_section(hash_data: dict[str, Any]) -> str:
+def _render_hash_filter_section(
+    out: io.StringIO, hash_data: dict[str, Any],
+) -> None:
     """Render hash-based filtering summary section."""
-    parts: list[str] = []
-    parts.append('<div class="e-value-verdict">')
-    parts.append("<h2>Hash-Based Filtering</h2>")
+    out.write('<div class="e-value-verdict">\n')
+    out.write("<h2>Hash-Based Filtering</h2>\n")
 
     changed = hash_data.get("changed", 0)
     unchanged = hash_data.get("unchanged", 0)
     skipped = hash_data.get("skipped", 0)
     total = changed + unchanged
 
-    parts.append(f"<strong>Total tests:</strong> {total}<br>")
-    parts.append(
+    out.write(f"<strong>Total tests:</strong> {total}<br>\n")
+    out.write(
         f"<strong>Changed:</strong> {changed} "
-        f"(target hash differs from last run)<br>"
+        f"(target hash differs from last run)<br>\n"
     )
-    parts.append(
+    out.write(
         f"<strong>Unchanged:</strong> {unchanged} "
-        f"(target hash matches last run)<br>"
+        f"(target hash matches last run)<br>\n"
     )
     if skipped > 0:
-        parts.append(
+        out.write(
             f"<strong>Skipped:</strong> {skipped} "
-            f"(unchanged + conclusive SPRT, excluded from execution)<br>"
+            f"(unchanged + conclusive SPRT, excluded from execution)<br>\n"
         )
 
-    parts.append("</div>")
-    return "\n".join(parts)
+    out.write("</div>\n")
 
 
-def _render_effort_section(effort_data: dict[str, Any]) -> str:
+def _render_effort_section(
+    out: io.StringIO, effort_data: dict[str, Any],
+) -> None:
     """Render effort mode SPRT classification section."""
-    parts: list[str] = []
-    parts.append('<div class="e-value-verdict">')
-    parts.append(f"<h2>Effort: {html.escape(str(effort_data.get('mode', '')))}</h2>")
+    out.write('<div class="e-value-verdict">\n')
+    out.write(f"<h2>Effort: {html.escape(str(effort_data.get('mode', '')))}</h2>\n")
 
     total_reruns = effort_data.get("total_reruns", 0)
     max_reruns = effort_data.get("max_reruns_per_test", 0)
-    parts.append(
+    out.write(
         f"<strong>Total reruns:</strong> {total_reruns} "
-        f"(budget: {max_reruns} per test)<br>"
+        f"(budget: {max_reruns} per test)<br>\n"
     )
 
     classifications = effort_data.get("classifications", {})
     if classifications:
-        parts.append(f"<strong>Tests classified:</strong> {len(classifications)}<br>")
+        out.write(f"<strong>Tests classified:</strong> {len(classifications)}<br>\n")
 
         # Summary counts
         counts: dict[str, int] = {}
@@ -1760,30 +1986,31 @@ def _render_effort_section(effort_data: dict[str, Any]) -> str:
             cls = c.get("classification", "unknown")
             counts[cls] = counts.get(cls, 0) + 1
         summary_parts = [f"{count} {cls}" for cls, count in sorted(counts.items())]
-        parts.append(f"<strong>Summary:</strong> {', '.join(summary_parts)}")
+        out.write(f"<strong>Summary:</strong> {', '.join(summary_parts)}\n")
 
         # Classification table
-        parts.append('<table class="measurements-table">')
-        parts.append(
+        out.write('<table class="measurements-table">\n')
+        out.write(
             "<tr><th>Test</th><th>Classification</th>"
-            "<th>Initial</th><th>Runs</th><th>Passes</th><th>SPRT</th></tr>"
+            "<th>Initial</th><th>Runs</th><th>Passes</th><th>SPRT</th></tr>\n"
         )
         for test_name, c in sorted(classifications.items()):
+            c_get = c.get
             tname = html.escape(str(test_name))
-            cls = c.get("classification", "")
-            color = _CLASSIFICATION_COLORS.get(cls, "#FFFFFF")
-            initial = c.get("initial_status", "")
-            runs = c.get("runs", 0)
-            passes = c.get("passes", 0)
-            sprt = c.get("sprt_decision", "")
-            parts.append(
+            cls = c_get("classification", "")
+            color = _CLASSIFICATION_COLORS[cls]
+            initial = c_get("initial_status", "")
+            runs = c_get("runs", 0)
+            passes = c_get("passes", 0)
+            sprt = c_get("sprt_decision", "")
+            out.write(
                 f"<tr><td>{tname}</td>"
-                f'<td style="background:{color}">{html.escape(cls)}</td>'
-                f"<td>{html.escape(initial)}</td>"
+                f'<td style="background:{color}">{_esc(cls)}</td>'
+                f"<td>{_esc(initial)}</td>"
                 f"<td>{runs}</td><td>{passes}</td>"
-                f"<td>{html.escape(sprt)}</td></tr>"
+                f"<td>{_esc(sprt)}</td></tr>\n"
             )
-        parts.append("</table>")
+        out.write("</table>\n")
 
     # Burn-in sweep results (if present)
     burn_in_sweep = effort_data.get("burn_in_sweep")
@@ -1792,70 +2019,70 @@ def _render_effort_section(effort_data: dict[str, Any]) -> str:
         decided = burn_in_sweep.get("decided", {})
         undecided = burn_in_sweep.get("undecided", [])
 
-        parts.append("<br><h3>Burn-in Sweep</h3>")
-        parts.append(
-            f"<strong>Sweep runs:</strong> {sweep_total}<br>"
+        out.write("<br><h3>Burn-in Sweep</h3>\n")
+        out.write(
+            f"<strong>Sweep runs:</strong> {sweep_total}<br>\n"
         )
         if decided:
-            parts.append(
-                f"<strong>Decided:</strong> {len(decided)} test(s)<br>"
+            out.write(
+                f"<strong>Decided:</strong> {len(decided)} test(s)<br>\n"
             )
-            parts.append('<table class="measurements-table">')
-            parts.append(
-                "<tr><th>Test</th><th>Result</th></tr>"
+            out.write('<table class="measurements-table">\n')
+            out.write(
+                "<tr><th>Test</th><th>Result</th></tr>\n"
             )
             for test_name, final_state in sorted(decided.items()):
                 tname = html.escape(str(test_name))
-                color = LIFECYCLE_COLORS.get(final_state, "#FFFFFF")
-                label = LIFECYCLE_LABELS.get(final_state, final_state)
-                parts.append(
+                color, label = _LIFECYCLE_BADGE.get(
+                    final_state, ("#FFFFFF", final_state),
+                )
+                out.write(
                     f"<tr><td>{tname}</td>"
                     f'<td><span class="lifecycle-badge" '
-                    f'style="background:{color}">{label}</span></td></tr>'
+                    f'style="background:{color}">{label}</span></td></tr>\n'
                 )
-            parts.append("</table>")
+            out.write("</table>\n")
         if undecided:
-            parts.append(
+            out.write(
                 f"<strong>Still burning in:</strong> "
-                f"{len(undecided)} test(s)<br>"
+                f"{len(undecided)} test(s)<br>\n"
             )
 
-    parts.append("</div>")
-    return "\n".join(parts)
+    out.write("</div>\n")
 
 
-def _render_regression_selection(selection: dict[str, Any]) -> str:
+def _render_regression_selection(
+    out: io.StringIO, selection: dict[str, Any],
+) -> None:
     """Render regression selection details."""
-    parts: list[str] = []
-    parts.append('<div class="regression-section">')
-    parts.append("<h2>Regression Selection</h2>")
+    out.write('<div class="regression-section">\n')
+    out.write("<h2>Regression Selection</h2>\n")
 
     changed = selection.get("changed_files", [])
     if changed:
-        parts.append("<details>")
-        parts.append(f"<summary>Changed Files ({len(changed)})</summary>")
-        parts.append("<ul>")
+        out.write("<details>\n")
+        out.write(f"<summary>Changed Files ({len(changed)})</summary>\n")
+        out.write("<ul>\n")
         for f in changed:
-            parts.append(f"<li>{html.escape(str(f))}</li>")
-        parts.append("</ul>")
-        parts.append("</details>")
+            out.write(f"<li>{html.escape(str(f))}</li>\n")
+        out.write("</ul>\n")
+        out.write("</details>\n")
 
     scores = selection.get("scores", {})
     if scores:
-        parts.append("<details>")
-        parts.append(f"<summary>Test Scores ({len(scores)})</summary>")
-        parts.append('<table class="measurements-table">')
-        parts.append("<tr><th>Test</th><th>Score</th></tr>")
+        out.write("<details>\n")
+        out.write(f"<summary>Test Scores ({len(scores)})</summary>\n")
+        out.write('<table class="measurements-table">\n')
+        out.write("<tr><th>Test</th><th>Score</th></tr>\n")
         for test_name, score in scores.items():
-            parts.append(
+            out.write(
                 f"<tr><td>{html.escape(str(test_name))}</td>"
-                f"<td>{score}</td></tr>"
+                f"<td>{score}</td></tr>\n"
             )
-        parts.append("</table>")
-        parts.append("</details>")
+        out.write("</table>\n")
+        out.write("</details>\n")
 
-    parts.append("</div>")
-    return "\n".join(parts)
+    out.write("</div>\n")
 
 
 # ---------------------------------------------------------------------------
@@ -2058,33 +2285,34 @@ _DAG_JS = """\
         disabled: '#999'
     };
 
-    var elements = [];
-    var i, d;
-    for (i = 0; i < GRAPH_DATA.nodes.length; i++) {
-        d = GRAPH_DATA.nodes[i].data;
-        elements.push({
-            group: 'nodes',
-            data: {
-                id: d.id, label: d.label, type: d.type,
-                status: d.status, lifecycle: d.lifecycle || '',
-                dagColor: d.dag_color || 'grey',
-                parameters: d.parameters || {}
-            },
-            classes: d.type
-        });
-    }
-    for (i = 0; i < GRAPH_DATA.edges.length; i++) {
-        d = GRAPH_DATA.edges[i].data;
-        elements.push({
-            group: 'edges',
-            data: d,
-            classes: d.type || 'dependency'
-        });
-    }
+    /* Large graphs draw through the WebGL renderer, which blits nodes and
+       labels from a texture atlas instead of repainting them with the 2D
+       canvas on every frame.  Its edges are limited to straight lines. */
+    var WEBGL_MIN_ELEMENTS = 2000;
+    var useWebgl = GRAPH_DATA.nodes.length + GRAPH_DATA.edges.length
+        >= WEBGL_MIN_ELEMENTS;
+    var edgeCurve = useWebgl ? 'straight' : 'bezier';
+
+    /* Dagre's ranking and crossing minimization dominate load time on
+       graphs with many hundreds of nodes, so those fall back to the
+       much cheaper built-in breadthfirst layout (still top-down). */
+    var BREADTHFIRST_MIN_NODES = 800;
+    var DAG_LAYOUT = GRAPH_DATA.nodes.length > BREADTHFIRST_MIN_NODES ? {
+        name: 'breadthfirst',
+        directed: true,
+        spacingFactor: 1.2
+    } : {
+        name: 'dagre',
+        rankDir: 'TB',
+        spacingFactor: 1.2,
+        nodeSep: 20,
+        rankSep: 40
+    };
 
     var cy = cytoscape({
         container: document.getElementById('dag-canvas'),
-        elements: elements,
+        elements: GRAPH_DATA,
+        renderer: {name: 'canvas', webgl: useWebgl},
         style: [
             {
                 selector: 'node.group',
@@ -2092,7 +2320,7 @@ _DAG_JS = """\
                     'shape': 'round-rectangle',
                     'corner-radius': 30,
                     'background-color': function(ele) {
-                        return DAG_COLORS[ele.data('dagColor')] || '#e8e8e8';
+                        return DAG_COLORS[ele.data('dag_color')] || '#e8e8e8';
                     },
                     'label': 'data(label)',
                     'text-valign': 'center',
@@ -2111,7 +2339,7 @@ _DAG_JS = """\
                 style: {
                     'shape': 'diamond',
                     'background-color': function(ele) {
-                        return DAG_COLORS[ele.data('dagColor')] || '#e8e8e8';
+                        return DAG_COLORS[ele.data('dag_color')] || '#e8e8e8';
                     },
                     'label': 'data(label)',
                     'text-valign': 'center',
@@ -2207,7 +2435,7 @@ _DAG_JS = """\
                     'line-color': '#bbb',
                     'target-arrow-color': '#bbb',
                     'target-arrow-shape': 'triangle',
-                    'curve-style': 'bezier',
+                    'curve-style': edgeCurve,
                     'arrow-scale': 0.8,
                     'line-style': 'solid'
                 }
@@ -2219,7 +2447,7 @@ _DAG_JS = """\
                     'line-color': '#666',
                     'target-arrow-color': '#666',
                     'target-arrow-shape': 'triangle',
-                    'curve-style': 'bezier',
+                    'curve-style': edgeCurve,
                     'arrow-scale': 0.8,
                     'line-style': 'dashed'
                 }
@@ -2232,15 +2460,15 @@ _DAG_JS = """\
                     'target-arrow-color': '#0d6efd',
                     'z-index': 10
                 }
+            },
+            {
+                selector: 'node.hidden-notrun',
+                style: {
+                    'display': 'none'
+                }
             }
         ],
-        layout: {
-            name: 'dagre',
-            rankDir: 'TB',
-            spacingFactor: 1.2,
-            nodeSep: 20,
-            rankSep: 40
-        },
+        layout: DAG_LAYOUT,
         userZoomingEnabled: true,
         userPanningEnabled: true,
         boxSelectionEnabled: false,
@@ -2249,15 +2477,18 @@ _DAG_JS = """\
     });
 
     /* Compute the minimum zoom level so the user cannot zoom out
-       beyond the level where the whole graph is visible. */
+       beyond the level where the whole graph is visible.  This is the
+       zoom cy.fit(undefined, 30) would pick, derived from the bounding
+       box so the viewport is never moved and restored. */
     var fitZoom = 0.05;
     function updateMinZoom() {
-        var prev = cy.zoom();
-        var prevPan = {x: cy.pan().x, y: cy.pan().y};
-        cy.fit(undefined, 30);
-        fitZoom = cy.zoom();
-        cy.zoom(prev);
-        cy.pan(prevPan);
+        var bb = cy.elements().boundingBox();
+        var pad = 30;
+        if (!(bb.w > 0 && bb.h > 0)) return;
+        var zoom = Math.min((cy.width() - 2 * pad) / bb.w,
+                            (cy.height() - 2 * pad) / bb.h);
+        if (!(zoom > 0)) return;
+        fitZoom = Math.min(zoom, cy.maxZoom());
         cy.minZoom(fitZoom);
     }
     cy.on('layoutstop', updateMinZoom);
@@ -2277,33 +2508,41 @@ _DAG_JS = """\
         cy.fit(undefined, 30);
     });
 
-    /* Toggle not-run tests visibility */
+    /* Toggle not-run tests visibility.  Hiding is a single class toggle
+       on the pre-selected not-run nodes; the re-layout then packs only
+       the elements that remain visible, and a toggle made while the
+       previous layout is still running stops it first. */
+    var notRunNodes = cy.nodes('[status = "undecided"], [status = "not_run"]');
+    var toggleLayout = null;
     var showAllCb = document.getElementById('dag-show-all');
     if (showAllCb) {
         showAllCb.addEventListener('change', function() {
-            var show = this.checked;
-            cy.batch(function() {
-                cy.nodes().forEach(function(node) {
-                    if (node.data('status') === 'undecided' || node.data('status') === 'not_run') {
-                        node.style('display', show ? 'element' : 'none');
-                    }
-                });
-            });
-            cy.layout({
-                name: 'dagre', rankDir: 'TB',
-                spacingFactor: 1.2, nodeSep: 20, rankSep: 40
-            }).run();
+            var visible = cy.elements();
+            if (this.checked) {
+                notRunNodes.removeClass('hidden-notrun');
+            } else {
+                notRunNodes.addClass('hidden-notrun');
+                visible = visible.not(notRunNodes)
+                    .not(notRunNodes.connectedEdges());
+            }
+            if (toggleLayout) toggleLayout.stop();
+            toggleLayout = visible.layout(DAG_LAYOUT);
+            toggleLayout.run();
         });
     }
 
-    /* Highlight connected edges for a node */
+    /* Highlight connected edges for a node.  Only the edges highlighted
+       last are cleared, not every edge in the graph. */
+    var highlighted = cy.collection();
     function highlightNode(node) {
-        cy.edges().removeClass('highlighted');
-        node.connectedEdges().addClass('highlighted');
+        highlighted.removeClass('highlighted');
+        highlighted = node.connectedEdges();
+        highlighted.addClass('highlighted');
     }
 
     function clearHighlights() {
-        cy.edges().removeClass('highlighted');
+        highlighted.removeClass('highlighted');
+        highlighted = cy.collection();
     }
 
     /* Resize handle for detail pane */
@@ -2313,6 +2552,15 @@ _DAG_JS = """\
     (function() {
         var dragging = false;
         var startX, startWidth;
+        /* Mouse moves are coalesced so the pane width and cy.resize()
+           are applied at most once per animation frame. */
+        var pendingWidth = 0;
+        var rafId = 0;
+        function applyWidth() {
+            rafId = 0;
+            detailPane.style.width = pendingWidth + 'px';
+            cy.resize();
+        }
         resizeHandle.addEventListener('mousedown', function(e) {
             dragging = true;
             startX = e.clientX;
@@ -2325,10 +2573,9 @@ _DAG_JS = """\
         document.addEventListener('mousemove', function(e) {
             if (!dragging) return;
             var delta = startX - e.clientX;
-            var newWidth = Math.max(200, Math.min(startWidth + delta,
+            pendingWidth = Math.max(200, Math.min(startWidth + delta,
                 splitPane.offsetWidth - 200));
-            detailPane.style.width = newWidth + 'px';
-            cy.resize();
+            if (!rafId) rafId = requestAnimationFrame(applyWidth);
         });
         document.addEventListener('mouseup', function() {
             if (!dragging) return;
@@ -2350,62 +2597,56 @@ _DAG_JS = """\
         cy.resize();
     }
 
-    /* Click test node to show detail pane */
-    cy.on('tap', 'node.test', function(evt) {
-        highlightNode(evt.target);
-        var nodeId = evt.target.data('id');
-        var entries = document.querySelectorAll('[data-test-name]');
-        var found = null;
+    /* Index the hidden detail entries by name once, so taps and search
+       selections look them up directly instead of scanning the DOM. */
+    function indexByAttr(attr) {
+        var map = new Map();
+        var entries = document.querySelectorAll('[' + attr + ']');
         for (var j = 0; j < entries.length; j++) {
-            if (entries[j].getAttribute('data-test-name') === nodeId) {
-                found = entries[j];
-                break;
-            }
+            var key = entries[j].getAttribute(attr);
+            if (!map.has(key)) map.set(key, entries[j]);
+        }
+        return map;
+    }
+    var testEntries = indexByAttr('data-test-name');
+    var gateEntries = indexByAttr('data-ci-gate-name');
+    var setEntries = indexByAttr('data-set-name');
+
+    /* Show a hidden entry in the detail pane.  Each entry is deep-cloned
+       once (no HTML serialize/re-parse) and the clone is reused on later
+       taps, keeping any sections the user expanded. */
+    var detailContent = document.getElementById('dag-detail-content');
+    var detailClones = new Map();
+    function showDetail(entry) {
+        var clone = detailClones.get(entry);
+        if (!clone) {
+            clone = entry.cloneNode(true);
+            clone.style.display = '';
+            detailClones.set(entry, clone);
         }
-        if (!found) return;
-        var content = document.getElementById('dag-detail-content');
         showDetailPane();
-        content.innerHTML = found.outerHTML;
+        detailContent.replaceChildren(clone);
+    }
+
+    /* Click test node to show detail pane */
+    cy.on('tap', 'node.test', function(evt) {
+        highlightNode(evt.target);
+        var found = testEntries.get(evt.target.data('id'));
+        if (found) showDetail(found);
     });
 
     /* Click ci_gate node to show detail pane */
     cy.on('tap', 'node.ci_gate', function(evt) {
         highlightNode(evt.target);
-        var nodeId = evt.target.data('id');
-        var entries = document.querySelectorAll('[data-ci-gate-name]');
-        var found = null;
-        for (var j = 0; j < entries.length; j++) {
-            if (entries[j].getAttribute('data-ci-gate-name') === nodeId) {
-                found = entries[j];
-                break;
-            }
-        }
-        if (!found) return;
-        var content = document.getElementById('dag-detail-content');
-        showDetailPane();
-        var clone = found.cloneNode(true);
-        clone.style.display = '';
-        content.innerHTML = clone.outerHTML;
+        var found = gateEntries.get(evt.target.data('id'));
+        if (found) showDetail(found);
     });
 
     /* Click group (set) node to show detail pane */
     cy.on('tap', 'node.group', function(evt) {
         highlightNode(evt.target);
-        var nodeId = evt.target.data('id');
-        var entries = document.querySelectorAll('[data-set-name]');
-        var found = null;
-        for (var j = 0; j < entries.length; j++) {
-            if (entries[j].getAttribute('data-set-name') === nodeId) {
-                found = entries[j];
-                break;
-            }
-        }
-        if (!found) return;
-        var content = document.getElementById('dag-detail-content');
-        showDetailPane();
-        var clone = found.cloneNode(true);
-        clone.style.display = '';
-        content.innerHTML = clone.outerHTML;
+        var found = setEntries.get(evt.target.data('id'));
+        if (found) showDetail(found);
     });
 
     /* Click background to clear selection and highlights */
@@ -2449,6 +2690,83 @@ _DAG_JS = """\
         return {scoped: scoped, unscoped: unscoped};
     }
 
+    /* The search index is embedded gzip-compressed and base64-encoded as
+       SEARCH_INDEX_GZ and inflated on the first search.  It is columnar:
+       ids, types, labels and each field are index-aligned arrays. */
+    var searchIndex = null;
+    var searchIndexLoading = null;
+
+    function loadSearchIndex() {
+        if (!searchIndexLoading) {
+            /* Started inside then() so a missing DecompressionStream or a
+               bad payload rejects the promise instead of throwing. */
+            searchIndexLoading = Promise.resolve().then(function() {
+                var bytes = Uint8Array.from(atob(SEARCH_INDEX_GZ),
+                    function(c) { return c.charCodeAt(0); });
+                var stream = new Blob([bytes]).stream()
+                    .pipeThrough(new DecompressionStream('gzip'));
+                return new Response(stream).json();
+            }).then(function(data) {
+                searchIndex = data;
+            }, function(err) {
+                /* Forget the failed attempt so the next search retries. */
+                searchIndexLoading = null;
+                throw err;
+            });
+        }
+        return searchIndexLoading;
+    }
+
+    /* Inverted token index, built once the search index is loaded:
+       token -> ordinals (positions in searchIds) of the entries containing
+       it, both per field and across all fields. */
+    var searchIds = null;
+    var allTokens = null;
+    var fieldTokens = null;
+
+    function addPosting(map, tok, i) {
+        var posting = map.get(tok);
+        if (!posting) {
+            posting = [];
+            map.set(tok, posting);
+        }
+        if (posting[posting.length - 1] !== i) posting.push(i);
+    }
+
+    function buildTokenIndex() {
+        searchIds = searchIndex.ids;
+        allTokens = new Map();
+        fieldTokens = {};
+        var fkeys = Object.keys(searchIndex.fields);
+        var columns = [];
+        for (var c = 0; c < fkeys.length; c++) {
+            fieldTokens[fkeys[c]] = new Map();
+            columns.push(searchIndex.fields[fkeys[c]]);
+        }
+        for (var i = 0; i < searchIds.length; i++) {
+            for (var f = 0; f < fkeys.length; f++) {
+                var map = fieldTokens[fkeys[f]];
+                var toks = columns[f][i].split(/\\s+/);
+                for (var t = 0; t < toks.length; t++) {
+                    if (!toks[t]) continue;
+                    addPosting(map, toks[t], i);
+                    addPosting(allTokens, toks[t], i);
+                }
+            }
+        }
+    }
+
+    /* Ordinals of entries with a token containing `term` (substring). */
+    function matchTerm(tokens, term) {
+        var found = new Set();
+        if (!tokens) return found;
+        tokens.forEach(function(posting, tok) {
+            if (tok.indexOf(term) === -1) return;
+            for (var k = 0; k < posting.length; k++) found.add(posting[k]);
+        });
+        return found;
+    }
+
     function performSearch(query) {
         var parsed = parseQuery(query);
         searchResults.innerHTML = '';
@@ -2465,47 +2783,77 @@ _DAG_JS = """\
             return;
         }
 
-        var matches = [];
-        var ids = Object.keys(SEARCH_INDEX);
+        if (searchIds === null) {
+            if (searchIndex === null) {
+                /* Re-read the box once loaded: it may have changed (or
+                   been cleared) while the index was inflating. */
+                loadSearchIndex().then(function() {
+                    performSearch(searchInput.value);
+                }, function() {
+                    if (searchInput.value.trim().length === 0) return;
+                    searchResults.innerHTML =
+                        '<div class="dag-search-no-results">' +
+                        'Search is unavailable in this browser</div>';
+                    searchResults.style.display = 'block';
+                });
+                return;
+            }
+            buildTokenIndex();
+        }
 
-        for (var i = 0; i < ids.length; i++) {
-            var entry = SEARCH_INDEX[ids[i]];
-            var fields = entry.fields;
-            var allMatch = true;
+        /* Each term is matched against the token vocabulary rather than
+           every entry's text: a whitespace-free term occurs in a field
+           exactly when it occurs in one of that field's tokens. */
+        var sets = [];
+        var phrases = [];
+        for (var s = 0; s < parsed.scoped.length; s++) {
+            var sk = parsed.scoped[s].keyword;
+            if (!sk) continue;
+            if (/\\s/.test(sk)) {
+                phrases.push(parsed.scoped[s]);
+            } else {
+                sets.push(matchTerm(fieldTokens[parsed.scoped[s].field], sk));
+            }
+        }
+        for (var u = 0; u < parsed.unscoped.length; u++) {
+            sets.push(matchTerm(allTokens, parsed.unscoped[u]));
+        }
+        sets.sort(function(a, b) { return a.size - b.size; });
 
-            /* Check scoped terms: each must match its specific field */
-            for (var s = 0; s < parsed.scoped.length; s++) {
-                var sf = parsed.scoped[s].field;
-                var sk = parsed.scoped[s].keyword;
-                var fieldText = fields[sf] || '';
-                if (fieldText.indexOf(sk) === -1) {
+        var hits = [];
+        if (sets.length > 0) {
+            sets[0].forEach(function(i) {
+                for (var k = 1; k < sets.length; k++) {
+                    if (!sets[k].has(i)) return;
+                }
+                hits.push(i);
+            });
+            hits.sort(function(a, b) { return a - b; });
+        } else {
+            for (var h = 0; h < searchIds.length; h++) hits.push(h);
+        }
+
+        var matches = [];
+        for (var i = 0; i < hits.length && matches.length < 20; i++) {
+            var idx = hits[i];
+            var allMatch = true;
+            /* Scoped phrases containing spaces span tokens; check them
+               against the full field text of the remaining candidates. */
+            for (var p = 0; p < phrases.length; p++) {
+                var column = searchIndex.fields[phrases[p].field];
+                var fieldText = (column && column[idx]) || '';
+                if (fieldText.indexOf(phrases[p].keyword) === -1) {
                     allMatch = false;
                     break;
                 }
             }
-            if (!allMatch) continue;
-
-            /* Check unscoped terms: each must match in ANY field */
-            if (parsed.unscoped.length > 0) {
-                var allFields = '';
-                var fkeys = Object.keys(fields);
-                for (var fk = 0; fk < fkeys.length; fk++) {
-                    allFields += fields[fkeys[fk]] + ' ';
-                }
-                for (var u = 0; u < parsed.unscoped.length; u++) {
-                    if (allFields.indexOf(parsed.unscoped[u]) === -1) {
-                        allMatch = false;
-                        break;
-                    }
-                }
-            }
-
             if (allMatch) {
                 matches.push({
-                    id: ids[i], type: entry.type, label: entry.label
+                    id: searchIds[idx],
+                    type: searchIndex.types[idx],
+                    label: searchIndex.labels[idx]
                 });
             }
-            if (matches.length >= 20) break;
         }
 
         if (matches.length === 0) {
@@ -2551,9 +2899,7 @@ _DAG_JS = """\
         if (node.length === 0) return;
 
         /* Make node visible if hidden (e.g. not_run with toggle off) */
-        if (node.style('display') === 'none') {
-            node.style('display', 'element');
-        }
+        node.removeClass('hidden-notrun');
 
         cy.elements().unselect();
         node.select();
@@ -2565,28 +2911,8 @@ _DAG_JS = """\
         }, {duration: 300});
 
         /* Open detail pane (mirrors tap handler logic) */
-        var content = document.getElementById('dag-detail-content');
-        var selector, attr;
-        if (nodeType === 'test') {
-            attr = 'data-test-name';
-        } else {
-            attr = 'data-set-name';
-        }
-        var entries = document.querySelectorAll('[' + attr + ']');
-        for (var j = 0; j < entries.length; j++) {
-            if (entries[j].getAttribute(attr) === nodeId) {
-                showDetailPane();
-                var el = entries[j];
-                if (nodeType === 'group') {
-                    var clone = el.cloneNode(true);
-                    clone.style.display = '';
-                    content.innerHTML = clone.outerHTML;
-                } else {
-                    content.innerHTML = el.outerHTML;
-                }
-                break;
-            }
-        }
+        var el = (nodeType === 'test' ? testEntries : setEntries).get(nodeId);
+        if (el) showDetail(el);
     }
 
     /* Debounced input handler (250ms) */
@@ -2654,9 +2980,58 @@ _DAG_JS = """\
 })();
 """
 
+# DAG markup that does not depend on the report: stylesheet, toolbar and
+# split pane ahead of the per-report data, CDN libraries and application
+# script after it.  Both are assembled once at import.
+_DAG_STATIC_HEADER = (
+    f"<style>{_DAG_CSS}</style>\n"
+    '<div class="dag-section">\n'
+    "<h2>Test DAG</h2>\n"
+    '<div class="dag-container">\n'
+    # Toolbar
+    '<div class="dag-toolbar">\n'
+    '<button id="dag-zoom-in" title="Zoom in">+</button>\n'
+    '<button id="dag-zoom-out" title="Zoom out">&minus;</button>\n'
+    '<button id="dag-fit" title="Fit to view">Fit</button>\n'
+    '<label style="margin-left:12px;font-size:13px;display:flex;'
+    'align-items:center;gap:4px;cursor:pointer">'
+    '<input type="checkbox" id="dag-show-all" checked>'
+    'Show all workspace tests</label>\n'
+    '<div class="dag-search-wrapper">'
+    '<input type="text" id="dag-search" class="dag-search-input"'
+    ' placeholder="Search tests...'
+    ' e.g. name:(email) check:(SMTP)" autocomplete="off">'
+    '<div id="dag-search-results" class="dag-search-results"></div>'
+    '</div>\n'
+    "</div>\n"
+    # Split pane: canvas + detail
+    '<div class="dag-split">\n'
+    '<div id="dag-canvas" class="dag-canvas"></div>\n'
+    '<div id="dag-resize-handle" class="dag-resize-handle"'
+    ' style="display:none"></div>\n'
+    '<div id="dag-detail" class="dag-detail" style="display:none">\n'
+    '<button id="dag-detail-close" class="dag-detail-close"'
+    ' title="Close">&times;</button>\n'
+    '<div id="dag-detail-content" class="dag-detail-content"></div>\n'
+    "</div>\n"  # dag-detail
+    "</div>\n"  # dag-split
+    "</div>\n"  # dag-container
+    "</div>\n"  # dag-section
+)
+_DAG_STATIC_LIBS = (
+    '<script src="https://unpkg.com/cytoscape@3.31.0/dist/'
+    'cytoscape.min.js"></script>\n'
+    '<script src="https://unpkg.com/dagre@0.8.5/dist/'
+    'dagre.min.js"></script>\n'
+    '<script src="https://unpkg.com/cytoscape-dagre@2.5.0/'
+    'cytoscape-dagre.js"></script>\n'
+    f"<script>{_DAG_JS}</script>\n"
+)
+
+
 
 # Map verdict state to a DAG display color (verdict + backward-compat).
-_STATUS_DAG_COLOR: dict[str, str] = {
+_STATUS_DAG_COLOR: dict[str, str] = _FallbackDict("grey", {
     # Verdict states
     "success": "green",
     "failed": "red",
@@ -2670,7 +3045,7 @@ _STATUS_DAG_COLOR: dict[str, str] = {
     "mixed": "red",
     "no_tests": "grey",
     "not_run": "blue",
-}
+})
 
 
 def _build_graph_data(test_set: dict[str, Any]) -> dict[str, Any]:
@@ -2681,37 +3056,34 @@ def _build_graph_data(test_set: dict[str, Any]) -> dict[str, Any]:
     regular edges so that the same node can appear as a member of
     multiple test sets (DAG, not tree).
 
-    After walking, a leaf-to-root pass computes ``dag_color`` for every
-    node: test nodes derive it from their run status; group nodes
-    aggregate from their direct member children (red if any child red,
-    grey if all children grey, green otherwise).
+    Every node's ``dag_color`` is mapped from its own status while the
+    node is created.  The status was already computed by
+    ``_aggregate_status()`` using four-state priority aggregation, so
+    colors are intentionally *not* aggregated from children: shared
+    nodes (deduplicated by ``_walk_dag_for_graph``) may carry a status
+    from a different parent context.
 
     Returns:
-        Dict with ``nodes`` and ``edges`` lists in Cytoscape elements format.
+        Dict with ``nodes`` and ``edges`` lists in Cytoscape elements format,
+        each element carrying its ``classes`` so the dict can be handed to
+        ``cytoscape()`` as-is.  The element kind (``group``/``ci_gate``/
+        ``test`` for nodes, ``member``/``dependency`` for edges) lives only
+        in ``classes``; it is not repeated in ``data``.
     """
     seen_nodes: dict[str, dict[str, Any]] = {}
     edges: list[dict[str, Any]] = []
+    # The synthetic "Workspace" root is never emitted — its children
+    # become top-level roots in the DAG (which may be disconnected).
     _walk_dag_for_graph(test_set, parent_id=None,
-                        seen_nodes=seen_nodes, edges=edges)
-
-    # Remove synthetic "Workspace" root node — its children become
-    # top-level roots in the DAG (which may be disconnected).
-    ws_name = "Workspace"
-    if ws_name in seen_nodes:
-        del seen_nodes[ws_name]
-        edges = [e for e in edges
-                 if e["data"]["source"] != ws_name
-                 and e["data"]["target"] != ws_name]
-
-    # Assign dag_color from each node's own status.  The status was already
-    # correctly computed by _aggregate_status() using four-state priority
-    # aggregation, so we just map it to a display color.  We intentionally
-    # do NOT aggregate colors from children because shared nodes
-    # (deduplicated by _walk_dag_for_graph) may carry a status from a
-    # different parent context.
-    for node in seen_nodes.values():
-        data = node["data"]
-        data["dag_color"] = _STATUS_DAG_COLOR.get(data["status"], "grey")
+                        seen_nodes=seen_nodes, edges=edges,
+                        skip_id="Workspace")
+
+    # A depends_on target outside this test_set (e.g. a partial report)
+    # has no node; Cytoscape would reject the edge, so drop it here.
+    edges = [
+        e for e in edges
+        if e["classes"] != "dependency" or e["data"]["target"] in seen_nodes
+    ]
 
     return {"nodes": list(seen_nodes.values()), "edges": edges}
 
@@ -2721,61 +3093,74 @@ def _walk_dag_for_graph(
     parent_id: str | None,
     seen_nodes: dict[str, dict[str, Any]],
     edges: list[dict[str, Any]],
+    skip_id: str | None = None,
 ) -> None:
-    """Recursively walk the test_set tree and populate graph elements.
+    """Walk the test_set tree and populate graph elements.
 
     Nodes are deduplicated so a test or subset appearing under multiple
     parents is emitted only once.  Membership is expressed as edges
-    from the parent test-set node to its children.
+    from the parent test-set node to its children.  A set named
+    *skip_id* is walked for its children but gets no node and no
+    membership edges of its own.
+
+    The walk uses an explicit stack (subsets pushed in reverse), which
+    emits nodes and edges in the same depth-first order as recursion
+    without being bounded by the recursion limit.
     """
-    node_id = node.get("name", "")
-    node_type = "ci_gate" if "ci_gate_params" in node else "group"
-    first_visit = node_id not in seen_nodes
-    if first_visit:
-        seen_nodes[node_id] = {"data": {
-            "id": node_id,
-            "label": node_id,
-            "type": node_type,
-            "status": node.get("status", "success"),
-        }}
-
-    if parent_id is not None:
-        edges.append({"data": {
-            "source": parent_id, "target": node_id, "type": "member",
-        }})
-
-    # If this node was already walked, its children (tests & subsets)
-    # have already been emitted — skip to avoid duplicate edges.
-    if not first_visit:
-        return
+    edges_append = edges.append
+    stack: list[tuple[dict[str, Any], str | None]] = [(node, parent_id)]
+    while stack:
+        node, parent_id = stack.pop()
+        node_id = node.get("name", "")
+        skipped = node_id == skip_id
+        first_visit = node_id not in seen_nodes
+        if first_visit and not skipped:
+            node_type = "ci_gate" if "ci_gate_params" in node else "group"
+            status = node.get("status", "success")
+            seen_nodes[node_id] = {"data": {
+                "id": node_id,
+                "label": node_id,
+                "status": status,
+                "dag_color": _STATUS_DAG_COLOR[status],
+            }, "classes": node_type}
+
+        if parent_id is not None and parent_id != skip_id and not skipped:
+            edges_append({"data": {
+                "source": parent_id, "target": node_id,
+            }, "classes": "member"})
+
+        # If this node was already walked, its children (tests & subsets)
+        # have already been emitted — skip to avoid duplicate edges.
+        if not first_visit:
+            continue
 
-    for test_name, test_data in node.get("tests", {}).items():
-        if test_name not in seen_nodes:
-            short_label = (
-                test_name.rsplit(":", 1)[-1] if ":" in test_name else test_name
-            )
-            lifecycle = test_data.get("lifecycle") or {}
-            parameters = test_data.get("parameters") or {}
-            seen_nodes[test_name] = {"data": {
-                "id": test_name,
-                "label": short_label,
-                "type": "test",
-                "status": test_data.get("status", "success"),
-                "lifecycle": lifecycle.get("state", ""),
-                "parameters": parameters,
-            }}
-        edges.append({"data": {
-            "source": node_id, "target": test_name, "type": "member",
-        }})
-        for dep in test_data.get("depends_on", []):
-            edges.append({"data": {
-                "source": test_name, "target": dep, "type": "dependency",
-            }})
-
-    for subset in node.get("subsets", []):
-        _walk_dag_for_graph(
-            subset, parent_id=node_id,
-            seen_nodes=seen_nodes, edges=edges,
+        for test_name, test_data in node.get("tests", {}).items():
+            if test_name not in seen_nodes:
+                # rpartition returns the whole name when there is no ":".
+                short_label = test_name.rpartition(":")[2]
+                lifecycle = test_data.get("lifecycle") or {}
+                parameters = test_data.get("parameters") or {}
+                status = test_data.get("status", "success")
+                seen_nodes[test_name] = {"data": {
+                    "id": test_name,
+                    "label": short_label,
+                    "status": status,
+                    "lifecycle": lifecycle.get("state", ""),
+                    "parameters": parameters,
+                    "dag_color": _STATUS_DAG_COLOR[status],
+                }, "classes": "test"}
+            if not skipped:
+                edges_append({"data": {
+                    "source": node_id, "target": test_name,
+                }, "classes": "member"})
+            for dep in test_data.get("depends_on", ()):
+                edges_append({"data": {
+                    "source": test_name, "target": dep,
+                }, "classes": "dependency"})
+
+        stack.extend(
+            (subset, node_id)
+            for subset in reversed(node.get("subsets", ()))
         )
 
 
@@ -2792,10 +3177,13 @@ _CAMEL_SPLIT_RE = re.compile(
 )
 
 
+@functools.lru_cache(maxsize=8192)
 def _decompose_identifier(text: str) -> str:
     """Decompose camelCase and snake_case identifiers into words.
 
     Returns the original text plus the decomposed words joined by spaces.
+    Test, step, feature and metric names recur across steps, blocks and
+    tests, so results are cached.
 
     Examples:
         ``"processPayment"`` → ``"processPayment process payment"``
@@ -2813,58 +3201,73 @@ def _decompose_identifier(text: str) -> str:
     return f"{text} {decomposed}"
 
 
+@functools.lru_cache(maxsize=8192)
+def _decompose_lower(text: str) -> str:
+    """Return ``_decompose_identifier(text)`` lowercased, as stored in the index."""
+    return _decompose_identifier(text).lower()
+
+
 def _collect_step_search_text(
     step: StepSegment,
-    features: list[str],
-    metrics: list[str],
-    checks: list[str],
+    add_feature: Callable[[str], None],
+    add_metric: Callable[[str], None],
+    add_check: Callable[[str], None],
 ) -> None:
-    """Extract searchable text from a step and its sub-steps."""
-    features.append(_decompose_identifier(step.step))
+    """Extract lowercased searchable text from a step and its sub-steps.
+
+    Text is passed to the bound ``append`` methods of the caller's
+    per-bucket lists, so the recursion never re-resolves them.
+    """
+    decompose = _decompose_lower
+    add_feature(decompose(step.step))
     if step.description:
-        features.append(_decompose_identifier(step.description))
+        add_feature(decompose(step.description))
     for f in step.features:
         name = f.get("name", "")
         if name:
-            features.append(_decompose_identifier(name))
+            add_feature(decompose(name))
     for m in step.measurements:
-        metrics.append(_decompose_identifier(str(m.get("name", ""))))
-        metrics.append(str(m.get("value", "")))
+        add_metric(decompose(str(m.get("name", ""))))
+        add_metric(str(m.get("value", "")).lower())
         unit = m.get("unit")
         if unit:
-            metrics.append(str(unit))
+            add_metric(str(unit).lower())
     for a in step.assertions:
-        checks.append(_decompose_identifier(str(a.get("description", ""))))
+        add_check(decompose(str(a.get("description", ""))))
     for sub in step.steps:
-        _collect_step_search_text(sub, features, metrics, checks)
+        _collect_step_search_text(sub, add_feature, add_metric, add_check)
 
 
 def _collect_block_search_text(
     block: BlockSegment,
 ) -> tuple[str, str, str]:
-    """Extract searchable text from a block and its steps.
+    """Extract lowercased searchable text from a block and its steps.
 
     Returns (features_text, metrics_text, checks_text).
     """
     features: list[str] = []
     metrics: list[str] = []
     checks: list[str] = []
+    add_feature = features.append
+    add_metric = metrics.append
+    add_check = checks.append
+    decompose = _decompose_lower
     if block.description:
-        features.append(_decompose_identifier(block.description))
+        add_feature(decompose(block.description))
     for f in block.features:
         name = f.get("name", "")
         if name:
-            features.append(_decompose_identifier(name))
+            add_feature(decompose(name))
     for m in block.measurements:
-        metrics.append(_decompose_identifier(str(m.get("name", ""))))
-        metrics.append(str(m.get("value", "")))
+        add_metric(decompose(str(m.get("name", ""))))
+        add_metric(str(m.get("value", "")).lower())
         unit = m.get("unit")
         if unit:
-            metrics.append(str(unit))
+            add_metric(str(unit).lower())
     for a in block.assertions:
-        checks.append(_decompose_identifier(str(a.get("description", ""))))
+        add_check(decompose(str(a.get("description", ""))))
     for step in block.steps:
-        _collect_step_search_text(step, features, metrics, checks)
+        _collect_step_search_text(step, add_feature, add_metric, add_check)
     return " ".join(features), " ".join(metrics), " ".join(checks)
 
 
@@ -2872,42 +3275,55 @@ def _walk_for_search_index(
     test_set: dict[str, Any],
     index: dict[str, dict[str, Any]],
 ) -> None:
-    """Recursively build search index entries for sets and tests."""
-    name = test_set.get("name", "")
-    node_type = "ci_gate" if "ci_gate_params" in test_set else "group"
-    if name and name != "Workspace":
-        name_parts = [_decompose_identifier(name)]
-        assertion = test_set.get("assertion", "")
-        index[name] = {
-            "type": node_type,
-            "label": name,
-            "fields": {
-                "name": " ".join(name_parts).lower(),
-                "assertion": _decompose_identifier(assertion).lower(),
-            },
-        }
+    """Build search index entries for sets and tests.
 
-    for test_name, test_data in test_set.get("tests", {}).items():
-        if test_name in index:
-            continue
-
-        name_text = _decompose_identifier(test_name)
-        assertion = test_data.get("assertion", "")
-        assertion_text = _decompose_identifier(assertion) if assertion else ""
-
-        param_parts: list[str] = []
-        for k, v in (test_data.get("parameters") or {}).items():
-            param_parts.append(_decompose_identifier(str(k)))
-            param_parts.append(_decompose_identifier(str(v)))
+    Walks the tree with an explicit stack (subsets pushed in reverse),
+    visiting sets in the same depth-first order as recursion.
+    """
+    decompose = _decompose_lower
+    stack = [test_set]
+    while stack:
+        test_set = stack.pop()
+        name = test_set.get("name", "")
+        node_type = "ci_gate" if "ci_gate_params" in test_set else "group"
+        if name and name != "Workspace":
+            assertion = test_set.get("assertion", "")
+            index[name] = {
+                "type": node_type,
+                "label": name,
+                "fields": {
+                    "name": decompose(name),
+                    "assertion": decompose(assertion),
+                },
+            }
 
-        feature_parts: list[str] = []
-        metric_parts: list[str] = []
-        check_parts: list[str] = []
-        stdout = test_data.get("stdout", "")
-        if stdout:
-            segments = parse_stdout_segments(stdout)
-            for seg in segments:
-                if isinstance(seg, BlockSegment):
+        for test_name, test_data in test_set.get("tests", {}).items():
+            if test_name in index:
+                continue
+
+            t_get = test_data.get
+            name_text = decompose(test_name)
+            assertion = t_get("assertion", "")
+            assertion_text = decompose(assertion) if assertion else ""
+
+            params = t_get("parameters")
+            param_text = " ".join([
+                decompose(str(x)) for kv in params.items() for x in kv
+            ]) if params else ""
+
+            feature_text = metric_text = check_text = ""
+            stdout = t_get("stdout", "")
+            # Blocks only come from [TST] sentinel lines; skip the parse
+            # (and the part lists) for output that has none.  Plain text
+            # is not indexed here (the log field covers it), so only
+            # blocks are requested; the isinstance check narrows the type.
+            if stdout and SENTINEL in stdout:
+                feature_parts: list[str] = []
+                metric_parts: list[str] = []
+                check_parts: list[str] = []
+                for seg in parse_stdout_segments(stdout, include_text=False):
+                    if not isinstance(seg, BlockSegment):
+                        continue
                     ft, mt, ct = _collect_block_search_text(seg)
                     if ft:
                         feature_parts.append(ft)
@@ -2915,29 +3331,29 @@ def _walk_for_search_index(
                         metric_parts.append(mt)
                     if ct:
                         check_parts.append(ct)
+                feature_text = " ".join(feature_parts)
+                metric_text = " ".join(metric_parts)
+                check_text = " ".join(check_parts)
 
-        log_text = stdout[:5000] if stdout else ""
+            log_text = stdout[:5000] if stdout else ""
 
-        short_label = (
-            test_name.rsplit(":", 1)[-1] if ":" in test_name
-            else test_name
-        )
-        index[test_name] = {
-            "type": "test",
-            "label": short_label,
-            "fields": {
-                "name": name_text.lower(),
-                "assertion": assertion_text.lower(),
-                "parameter": " ".join(param_parts).lower(),
-                "metric": " ".join(metric_parts).lower(),
-                "check": " ".join(check_parts).lower(),
-                "feature": " ".join(feature_parts).lower(),
-                "log": log_text.lower(),
-            },
-        }
+            # rpartition returns the whole name when there is no ":".
+            short_label = test_name.rpartition(":")[2]
+            index[test_name] = {
+                "type": "test",
+                "label": short_label,
+                "fields": {
+                    "name": name_text,
+                    "assertion": assertion_text,
+                    "parameter": param_text,
+                    "metric": metric_text,
+                    "check": check_text,
+                    "feature": feature_text,
+                    "log": log_text.lower(),
+                },
+            }
 
-    for subset in test_set.get("subsets", []):
-        _walk_for_search_index(subset, index)
+        stack.extend(reversed(test_set.get("subsets", ())))
 
 
 def _build_search_index(
@@ -2954,7 +3370,55 @@ def _build_search_index(
     return index
 
 
+# Searchable fields, in the order they are embedded.  Set entries only
+# carry name and assertion; their other columns are empty strings.
+_SEARCH_FIELDS = (
+    "name", "assertion", "parameter", "metric", "check", "feature", "log",
+)
+
+
+def _columnar_search_index(
+    index: dict[str, dict[str, Any]],
+) -> dict[str, Any]:
+    """Lay the search index out as index-aligned columns for embedding.
+
+    Returns ``{"ids": [...], "types": [...], "labels": [...],
+    "fields": {field: [...]}}`` where position ``i`` of every list
+    describes the same node, so per-entry key names are written once
+    rather than once per node.
+    """
+    entries = index.values()
+    columns = {
+        field: [e["fields"].get(field, "") for e in entries]
+        for field in _SEARCH_FIELDS
+    }
+    return {
+        "ids": list(index),
+        "types": [e["type"] for e in entries],
+        "labels": [e["label"] for e in entries],
+        "fields": columns,
+    }
+
+
+def _encode_search_index(index: dict[str, dict[str, Any]]) -> str:
+    """Serialize the search index for embedding as ``SEARCH_INDEX_GZ``.
+
+    The columnar JSON is gzip-compressed and base64-encoded; the browser
+    inflates it with ``DecompressionStream`` the first time the user
+    searches.  ``mtime=0`` keeps the output identical across runs.
+    """
+    search_json = json.dumps(
+        _columnar_search_index(index),
+        separators=(",", ":"), ensure_ascii=False,
+    )
+    compressed = gzip.compress(
+        search_json.encode("utf-8"), compresslevel=6, mtime=0,
+    )
+    return base64.b64encode(compressed).decode("ascii")
+
+
 def _render_dag_data_elements(
+    out: io.StringIO,
     test_set: dict[str, Any],
     history: dict[str, list[dict[str, Any]]],
     lifecycle_config: dict[str, Any] | None = None,
@@ -2963,7 +3427,7 @@ def _render_dag_data_elements(
     e_value_verdict: dict[str, Any] | None = None,
     effort_data: dict[str, Any] | None = None,
     ci_gate_name: str | None = None,
-) -> str:
+) -> None:
     """Render hidden data elements for the DAG detail pane.
 
     Produces hidden test-entry divs (``data-test-name``), set
@@ -2971,50 +3435,33 @@ def _render_dag_data_elements(
     (``data-ci-gate-name``) so that the Cytoscape tap handlers
     can clone them into the detail pane.
     """
-    parts: list[str] = []
-    parts.append('<div style="display:none">')
+    out.write('<div style="display:none">\n')
     _walk_for_data_elements(
-        test_set, history, lifecycle_config, source_link_base, parts,
+        out, test_set, history, lifecycle_config, source_link_base,
         e_value_verdict=e_value_verdict,
         effort_data=effort_data,
         ci_gate_name=ci_gate_name,
     )
-    parts.append("</div>")
-    return "\n".join(parts)
+    out.write("</div>\n")
 
 
 def _walk_for_data_elements(
+    out: io.StringIO,
     test_set: dict[str, Any],
     history: dict[str, list[dict[str, Any]]],
     lifecycle_config: dict[str, Any] | None,
     source_link_base: str | None,
-    parts: list[str],
     *,
     e_value_verdict: dict[str, Any] | None = None,
     effort_data: dict[str, Any] | None = None,
     ci_gate_name: str | None = None,
 ) -> None:
-    """Recursively collect hidden data elements for every set, test, and ci_gate."""
-    # CI gate card
-    if "ci_gate_params" in test_set:
-        parts.append(_render_ci_gate_card(
-            test_set,
-            e_value_verdict=e_value_verdict,
-            effort_data=effort_data,
-            ci_gate_name=ci_gate_name,
-        ))
-    else:
-        # Set summary card (with inline e-value/effort for executing gate's test_set)
-        set_test_names = _collect_test_names(test_set)
-        set_history = _compute_set_history(set_test_names, history)
-        parts.append(_render_set_summary_card(
-            test_set, lifecycle_config, set_history,
-            e_value_verdict=e_value_verdict,
-            effort_data=effort_data,
-            ci_gate_name=ci_gate_name,
-        ))
-
-    # Individual test entries
+    """Write hidden data elements for every set, test, and ci_gate.
+
+    Walks the tree with an explicit stack (subsets pushed in reverse),
+    writing sets in the same depth-first order as recursion.
+    """
+    # Per-test lookups are report-wide, so they are built once.
     effort_classifications = (
         effort_data.get("classifications", {}) if effort_data else {}
     )
@@ -3023,31 +3470,80 @@ def _walk_for_data_elements(
         for tv in e_value_verdict.get("per_test", []):
             ev_per_test[tv.get("test_name", "")] = tv
 
-    for test_name, test_data in test_set.get("tests", {}).items():
-        parts.append(_render_test_entry(
-            test_name, test_data, history.get(test_name, []),
-            source_link_base=source_link_base,
-            effort_classification=effort_classifications.get(test_name),
-            e_value_per_test=ev_per_test.get(test_name),
-        ))
-
-    # Recurse into subsets
-    for subset in test_set.get("subsets", []):
-        _walk_for_data_elements(
-            subset, history, lifecycle_config, source_link_base, parts,
-            e_value_verdict=e_value_verdict,
-            effort_data=effort_data,
-            ci_gate_name=ci_gate_name,
-        )
+    # A test referenced from several sets gets the same history and
+    # lookups each time, so its entry is rendered once and the markup
+    # reused whenever the test data is equal to the first occurrence.
+    name_counts: dict[str, int] = {}
+    for test_name in _collect_test_names(test_set):
+        name_counts[test_name] = name_counts.get(test_name, 0) + 1
+    rendered: dict[str, tuple[dict[str, Any], str]] = {}
+
+    stack = [test_set]
+    while stack:
+        test_set = stack.pop()
+        # CI gate card
+        if "ci_gate_params" in test_set:
+            _render_ci_gate_card(
+                out, test_set,
+                e_value_verdict=e_value_verdict,
+                effort_data=effort_data,
+                ci_gate_name=ci_gate_name,
+            )
+        else:
+            # Set summary card (with inline e-value/effort for the
+            # executing gate's test_set)
+            set_test_names = _collect_test_names(test_set)
+            set_history = _compute_set_history(set_test_names, history)
+            _render_set_summary_card(
+                out, test_set, lifecycle_config, set_history,
+                e_value_verdict=e_value_verdict,
+                effort_data=effort_data,
+                ci_gate_name=ci_gate_name,
+            )
+
+        # Individual test entries
+        for test_name, test_data in test_set.get("tests", {}).items():
+            if name_counts[test_name] == 1:
+                _render_test_entry(
+                    out, test_name, test_data, history.get(test_name, []),
+                    source_link_base=source_link_base,
+                    effort_classification=effort_classifications.get(
+                        test_name),
+                    e_value_per_test=ev_per_test.get(test_name),
+                )
+                continue
+            cached = rendered.get(test_name)
+            if cached is None or cached[0] != test_data:
+                buf = io.StringIO()
+                _render_test_entry(
+                    buf, test_name, test_data, history.get(test_name, []),
+                    source_link_base=source_link_base,
+                    effort_classification=effort_classifications.get(
+                        test_name),
+                    e_value_per_test=ev_per_test.get(test_name),
+                )
+                cached = rendered[test_name] = (test_data, buf.getvalue())
+            out.write(cached[1])
+
+        stack.extend(reversed(test_set.get("subsets", ())))
 
 
 def _render_dag_section(
+    out: io.StringIO,
     report: dict[str, Any],
     history: dict[str, list[dict[str, Any]]] | None = None,
     lifecycle_config: dict[str, Any] | None = None,
     source_link_base: str | None = None,
-) -> str:
-    """Render the interactive DAG visualization section."""
+    data_prefix: Path | None = None,
+) -> None:
+    """Render the interactive DAG visualization section.
+
+    The graph data and search index are inlined in ``<script>`` tags.
+    When ``data_prefix`` is given they are written to
+    ``<data_prefix>.graph.js`` and ``<data_prefix>.search.js`` instead
+    and referenced by file name, so the browser loads them alongside the
+    page rather than tokenizing them as part of the HTML.
+    """
     test_set = report.get("test_set", {})
     graph_data = _build_graph_data(test_set)
     search_index = _build_search_index(test_set)
@@ -3058,88 +3554,36 @@ def _render_dag_section(
     if sf_history:
         history = sf_history
 
-    parts: list[str] = []
-    parts.append(f"<style>{_DAG_CSS}</style>")
-    parts.append('<div class="dag-section">')
-    parts.append("<h2>Test DAG</h2>")
-    parts.append('<div class="dag-container">')
-
-    # Toolbar
-    parts.append('<div class="dag-toolbar">')
-    parts.append('<button id="dag-zoom-in" title="Zoom in">+</button>')
-    parts.append(
-        '<button id="dag-zoom-out" title="Zoom out">&minus;</button>'
-    )
-    parts.append('<button id="dag-fit" title="Fit to view">Fit</button>')
-    parts.append(
-        '<label style="margin-left:12px;font-size:13px;display:flex;'
-        'align-items:center;gap:4px;cursor:pointer">'
-        '<input type="checkbox" id="dag-show-all" checked>'
-        'Show all workspace tests</label>'
-    )
-    parts.append(
-        '<div class="dag-search-wrapper">'
-        '<input type="text" id="dag-search" class="dag-search-input"'
-        ' placeholder="Search tests...'
-        ' e.g. name:(email) check:(SMTP)" autocomplete="off">'
-        '<div id="dag-search-results" class="dag-search-results"></div>'
-        '</div>'
-    )
-    parts.append("</div>")
-
-    # Split pane: canvas + detail
-    parts.append('<div class="dag-split">')
-    parts.append('<div id="dag-canvas" class="dag-canvas"></div>')
-    parts.append(
-        '<div id="dag-resize-handle" class="dag-resize-handle"'
-        ' style="display:none"></div>'
-    )
-    parts.append(
-        '<div id="dag-detail" class="dag-detail" style="display:none">'
-    )
-    parts.append(
-        '<button id="dag-detail-close" class="dag-detail-close"'
-        ' title="Close">&times;</button>'
-    )
-    parts.append(
-        '<div id="dag-detail-content" class="dag-detail-content"></div>'
-    )
-    parts.append("</div>")  # dag-detail
-    parts.append("</div>")  # dag-split
-    parts.append("</div>")  # dag-container
-    parts.append("</div>")  # dag-section
+    out.write(_DAG_STATIC_HEADER)
 
     # Hidden data elements for detail pane (test entries + set summaries + ci_gates)
-    parts.append(_render_dag_data_elements(
-        test_set, history or {},
+    _render_dag_data_elements(
+        out, test_set, history or {},
         lifecycle_config=lifecycle_config,
         source_link_base=source_link_base,
         e_value_verdict=report.get("e_value_verdict"),
         effort_data=report.get("effort"),
         ci_gate_name=report.get("ci_gate_name"),
-    ))
-
-    # Embedded data
-    graph_json = json.dumps(graph_data, separators=(",", ":"))
-    parts.append(f"<script>var GRAPH_DATA={graph_json};</script>")
-    search_json = json.dumps(search_index, separators=(",", ":"))
-    parts.append(f"<script>var SEARCH_INDEX={search_json};</script>")
-
-    # CDN libraries
-    parts.append(
-        '<script src="https://unpkg.com/cytoscape@3.30.4/dist/'
-        'cytoscape.min.js"></script>'
-    )
-    parts.append(
-        '<script src="https://unpkg.com/dagre@0.8.5/dist/'
-        'dagre.min.js"></script>'
     )
-    parts.append(
-        '<script src="https://unpkg.com/cytoscape-dagre@2.5.0/'
-        'cytoscape-dagre.js"></script>'
+
+    # Embedded data.  The page is UTF-8, so non-ASCII names are written
+    # as-is instead of being expanded to \uXXXX escapes.
+    graph_json = json.dumps(
+        graph_data, separators=(",", ":"), ensure_ascii=False,
     )
+    graph_js = f"var GRAPH_DATA={graph_json};"
+    search_js = f'var SEARCH_INDEX_GZ="{_encode_search_index(search_index)}";'
+    if data_prefix is None:
+        out.write(f"<script>{graph_js}</script>\n")
+        out.write(f"<script>{search_js}</script>\n")
+    else:
+        for suffix, script in ((".graph.js", graph_js),
+                               (".search.js", search_js)):
+            data_path = data_prefix.with_name(data_prefix.name + suffix)
+            data_path.write_text(script, encoding="utf-8")
+            src = html.escape(quote(data_path.name), quote=True)
+            out.write(f'<script src="{src}"></script>\n')
 
-    # Application JavaScript
-    parts.append(f"<script>{_DAG_JS}</script>")
+    # CDN libraries and application JavaScript
+    out.write(_DAG_STATIC_LIBS)
 
-    return "\n".join(parts)
@@ -2,17 +2,25 @@
 
 from __future__ import annotations
 
+import collections
+import functools
+import io
 import json
-import tempfile
+import re
 from pathlib import Path
 
 import pytest
 
+from orchestrator.reporting import html_reporter
 from orchestrator.reporting.html_reporter import (
     LIFECYCLE_COLORS,
     LIFECYCLE_LABELS,
     STATUS_COLORS,
     STATUS_LABELS,
+    _collect_test_names,
+    _esc,
+    _render_effort_section,
+    _render_lifecycle_badge,
     generate_html_from_file,
     generate_html_report,
     write_html_report,
@@ -84,37 +92,62 @@ def _make_hierarchical_report(
     }
 
 
-class TestGenerateHtmlReport:
-    """Tests for generate_html_report function."""
+def _extract_graph_json(html: str) -> str:
+    """The raw ``GRAPH_DATA`` JSON embedded in a rendered report."""
+    return html.partition("var GRAPH_DATA=")[2].partition(";</script>")[0]
 
-    def test_returns_valid_html_structure(self):
-        """Output contains DOCTYPE, html, head, body tags."""
-        report = _make_flat_report()
-        result = generate_html_report(report)
-        assert "<!DOCTYPE html>" in result
-        assert "<html" in result
-        assert "<head>" in result
-        assert "<body>" in result
-        assert "</html>" in result
 
-    def test_contains_title(self):
-        """Output contains the report title."""
-        report = _make_flat_report()
-        result = generate_html_report(report)
-        assert "<title>Test Report</title>" in result
+# A hidden set summary card runs from its data-set-name attribute to the
+# next hidden DAG data element (or the end of the document).
+_SET_CARD_RE = re.compile(
+    r'data-set-name="(?P<name>[^"]*)"(?P<body>.*?)'
+    r'(?=data-(?:set|test|ci-gate)-name="|\Z)',
+    re.DOTALL,
+)
 
-    def test_contains_css(self):
-        """Output contains inline CSS."""
-        report = _make_flat_report()
-        result = generate_html_report(report)
-        assert "<style>" in result
-        assert "font-family" in result
 
-    def test_contains_generated_at(self):
-        """Output shows generation timestamp."""
-        report = _make_flat_report()
-        result = generate_html_report(report)
-        assert "2026-01-01T00:00:00" in result
+@functools.lru_cache(maxsize=32)
+def _set_cards(html: str) -> dict[str, str]:
+    """Map each set name to its hidden summary card markup, in one scan."""
+    return {
+        m.group("name"): m.group("body")
+        for m in _SET_CARD_RE.finditer(html)
+    }
+
+
+# The default flat report, serialized once for file-based tests.
+_FLAT_REPORT_JSON = json.dumps(_make_flat_report()).encode("utf-8")
+
+
+def _assert_contains_all(result: str, *needles: str) -> None:
+    """Assert every needle occurs in ``result``, listing all that don't."""
+    missing = [n for n in needles if n not in result]
+    assert not missing, f"missing from output: {missing}"
+
+
+@pytest.fixture(scope="module")
+def default_flat_html() -> str:
+    """HTML for the default flat report, rendered once per module."""
+    return generate_html_report(_make_flat_report())
+
+
+@pytest.fixture(scope="module")
+def default_hierarchical_html() -> str:
+    """HTML for the default hierarchical report, rendered once per module."""
+    return generate_html_report(_make_hierarchical_report())
+
+
+class TestGenerateHtmlReport:
+    """Tests for generate_html_report function."""
+
+    def test_html_contains(self, default_flat_html):
+        """Output has the document skeleton, title, CSS, timestamp and tests."""
+        _assert_contains_all(
+            default_flat_html,
+            "<!DOCTYPE html>", "<html", "<head>", "<body>", "</html>",
+            "<title>Test Report</title>", "<style>", "font-family",
+            "2026-01-01T00:00:00", "test_a", "A works",
+        )
 
     def test_contains_commit_hash(self):
         """Output shows commit hash when present."""
@@ -123,13 +156,6 @@ class TestGenerateHtmlReport:
         result = generate_html_report(report)
         assert "abc123def" in result
 
-    def test_flat_tests_rendered(self):
-        """Flat test names appear in output."""
-        report = _make_flat_report()
-        result = generate_html_report(report)
-        assert "test_a" in result
-        assert "A works" in result
-
     def test_summary_counts_rendered(self):
         """Summary counts appear in output."""
         tests = [
@@ -158,10 +184,9 @@ class TestGenerateHtmlReport:
 class TestStatusColors:
     """Tests for color-coded statuses."""
 
-    def test_passed_color_in_output(self):
+    def test_passed_color_in_output(self, default_flat_html):
         """Passed status uses green color."""
-        report = _make_flat_report()
-        result = generate_html_report(report)
+        result = default_flat_html
         assert STATUS_COLORS["passed"] in result
 
     def test_failed_color_in_output(self):
@@ -184,6 +209,14 @@ class TestStatusColors:
         for status in STATUS_COLORS:
             assert status in STATUS_LABELS
 
+    def test_unknown_status_label_upper_cased(self):
+        """Statuses without a label render as their upper-cased name."""
+        tests = [{"name": "t", "status": "quarantined",
+                  "duration_seconds": 1.0}]
+        report = _make_flat_report(tests=tests)
+        result = generate_html_report(report)
+        assert ">QUARANTINED</span>" in result
+
     def test_hierarchical_status_colors(self):
         """Hierarchical test set shows correct color for aggregated status."""
         report = _make_hierarchical_report(status="failed")
@@ -200,10 +233,9 @@ class TestHierarchicalReport:
         result = generate_html_report(report)
         assert "checkout_tests" in result
 
-    def test_test_set_assertion_rendered(self):
+    def test_test_set_assertion_rendered(self, default_hierarchical_html):
         """Test set assertion appears in output."""
-        report = _make_hierarchical_report()
-        result = generate_html_report(report)
+        result = default_hierarchical_html
         assert "Suite passes" in result
 
     def test_nested_tests_rendered(self):
@@ -219,10 +251,9 @@ class TestHierarchicalReport:
         assert "test_a" in result
         assert "test_b" in result
 
-    def test_test_set_status_badge(self):
+    def test_test_set_status_badge(self, default_hierarchical_html):
         """Test set has a status badge."""
-        report = _make_hierarchical_report(status="passed")
-        result = generate_html_report(report)
+        result = default_hierarchical_html
         assert "PASSED" in result
 
 
@@ -270,6 +301,51 @@ class TestNestedTestSets:
         assert 'data-test-name="test_a"' in result
         assert 'data-test-name="test_b"' in result
 
+    def test_shared_test_rendered_identically_in_each_set(self):
+        """A test referenced from two sets gets the same entry markup twice."""
+        shared = {"status": "failed", "duration_seconds": 1.0,
+                  "stdout": "boom"}
+        report = self._make_nested_report()
+        root = report["report"]["test_set"]
+        root["tests"]["shared"] = dict(shared)
+        root["subsets"][0]["tests"]["shared"] = dict(shared)
+        result = generate_html_report(report)
+        assert result.count('data-test-name="shared"') == 2
+        assert result.count("boom") == 2
+
+    def test_shared_name_with_different_data_rendered_separately(self):
+        """Equal names with different data are not served from the cache."""
+        report = self._make_nested_report()
+        root = report["report"]["test_set"]
+        root["tests"]["shared"] = {"status": "passed", "stdout": "first"}
+        root["subsets"][0]["tests"]["shared"] = {
+            "status": "failed", "stdout": "second",
+        }
+        result = generate_html_report(report)
+        assert "first" in result
+        assert "second" in result
+
+    def test_collect_test_names_depth_first_order(self):
+        """Test names are collected depth-first in declaration order."""
+        test_set = {
+            "tests": {"a": {}},
+            "subsets": [
+                {"tests": {"b": {}}, "subsets": [{"tests": {"c": {}}}]},
+                {"tests": {"d": {}}},
+            ],
+        }
+        assert _collect_test_names(test_set) == ["a", "b", "c", "d"]
+
+    def test_collect_test_names_deeply_nested(self):
+        """Nesting deeper than the recursion limit is collected."""
+        test_set: dict = {"tests": {"leaf": {}}}
+        for i in range(5000):
+            test_set = {"tests": {f"t{i}": {}}, "subsets": [test_set]}
+        names = _collect_test_names(test_set)
+        assert len(names) == 5001
+        assert names[0] == "t4999"
+        assert names[-1] == "leaf"
+
 
 class TestExpandableSections:
     """Tests for expandable log and measurement sections."""
@@ -295,12 +371,9 @@ class TestExpandableSections:
         result = generate_html_report(report)
         assert "Error occurred" in result
 
-    def test_no_logs_no_log_section(self):
+    def test_no_logs_no_log_section(self, default_flat_html):
         """No log section when no logs present."""
-        tests = [{"name": "t", "status": "passed", "duration_seconds": 1.0}]
-        report = _make_flat_report(tests=tests)
-        result = generate_html_report(report)
-        assert 'class="log-section"' not in result
+        assert 'class="log-section"' not in default_flat_html
 
     def test_structured_stdout_measurements_in_table(self):
         """Measurements from [TST] stdout appear in a table."""
@@ -316,10 +389,10 @@ class TestExpandableSections:
         }
         report = _make_hierarchical_report(tests=tests)
         result = generate_html_report(report)
-        assert "latency" in result
-        assert "42" in result
-        assert "ms" in result
-        assert "measurements-table" in result
+        _assert_contains_all(
+            result,
+            "latency", "42", "ms", "measurements-table",
+        )
 
     def test_structured_stdout_blocks_rendered(self):
         """Block types from [TST] stdout are rendered as block segments."""
@@ -338,9 +411,27 @@ class TestExpandableSections:
         }
         report = _make_hierarchical_report(tests=tests)
         result = generate_html_report(report)
-        assert "block-rigging" in result
-        assert "block-stimulation" in result
-        assert "block-checkpoint" in result
+        _assert_contains_all(
+            result,
+            "block-rigging", "block-stimulation", "block-checkpoint",
+        )
+
+    def test_structured_stdout_non_string_names_rendered(self):
+        """Measurements and assertions with non-string names still render."""
+        tests = {
+            "t": {
+                "assertion": "A", "status": "passed", "duration_seconds": 1.0,
+                "stdout": (
+                    '[TST] {"type": "block_start", "block": "stimulation"}\n'
+                    '[TST] {"type": "measurement", "name": 42, "value": 1}\n'
+                    '[TST] {"type": "result", "name": 7, "passed": true}\n'
+                    '[TST] {"type": "block_end", "block": "stimulation"}'
+                ),
+            },
+        }
+        report = _make_hierarchical_report(tests=tests)
+        result = generate_html_report(report)
+        assert "measurements-table" in result
 
     def test_structured_stdout_errors_rendered(self):
         """Errors from [TST] stdout are rendered."""
@@ -420,10 +511,10 @@ class TestBurnInSection:
         }
         report = _make_hierarchical_report(tests=tests)
         result = generate_html_report(report)
-        assert "10 runs" in result
-        assert "10 passes" in result
-        assert "accept" in result
-        assert "burn-in-info" in result
+        _assert_contains_all(
+            result,
+            "10 runs", "10 passes", "accept", "burn-in-info",
+        )
 
 
 class TestInferredDependencies:
@@ -442,9 +533,10 @@ class TestInferredDependencies:
         }
         report = _make_hierarchical_report(tests=tests)
         result = generate_html_report(report)
-        assert "power_supply" in result
-        assert "sensor_calibration" in result
-        assert "Inferred Dependencies" in result
+        _assert_contains_all(
+            result,
+            "power_supply", "sensor_calibration", "Inferred Dependencies",
+        )
 
 
 class TestRegressionSelection:
@@ -458,55 +550,81 @@ class TestRegressionSelection:
             "scores": {"auth_test": 0.85, "payment_test": 0.72},
         }
         result = generate_html_report(report)
-        assert "Regression Selection" in result
-        assert "src/auth.py" in result
-        assert "src/payment.py" in result
-        assert "auth_test" in result
-        assert "0.85" in result
+        _assert_contains_all(
+            result,
+            "Regression Selection", "src/auth.py", "src/payment.py",
+            "auth_test", "0.85",
+        )
 
-    def test_no_regression_section_when_absent(self):
+    def test_no_regression_section_when_absent(self, default_flat_html):
         """No regression section when not in report."""
-        report = _make_flat_report()
-        result = generate_html_report(report)
+        result = default_flat_html
         assert "Regression Selection" not in result
 
 
 class TestWriteHtmlReport:
     """Tests for write_html_report function."""
 
-    def test_writes_file(self):
+    def test_writes_file(self, tmp_path):
         """write_html_report creates a file."""
         report = _make_flat_report()
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir) / "report.html"
-            write_html_report(report, path)
-            assert path.exists()
-            content = path.read_text()
-            assert "<!DOCTYPE html>" in content
-
-    def test_creates_parent_directories(self):
+        path = tmp_path / "report.html"
+        write_html_report(report, path)
+        assert path.exists()
+        content = path.read_text()
+        assert "<!DOCTYPE html>" in content
+
+    def test_creates_parent_directories(self, tmp_path):
         """write_html_report creates parent dirs if needed."""
         report = _make_flat_report()
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir) / "sub" / "dir" / "report.html"
-            write_html_report(report, path)
-            assert path.exists()
+        path = tmp_path / "sub" / "dir" / "report.html"
+        write_html_report(report, path)
+        assert path.exists()
+
+    def test_file_matches_generated_html(self, tmp_path):
+        """Written file is the UTF-8 encoding of generate_html_report."""
+        report = _make_hierarchical_report()
+        path = tmp_path / "report.html"
+        write_html_report(report, path)
+        expected = generate_html_report(report).encode("utf-8")
+        assert path.read_bytes() == expected
+
+    def test_external_data_written_to_sibling_files(self, tmp_path):
+        """external_data moves DAG data into <stem>.graph/.search.js."""
+        report = _make_hierarchical_report()
+        path = tmp_path / "report.html"
+        write_html_report(report, path, external_data=True)
+        content = path.read_text()
+        graph = (tmp_path / "report.graph.js").read_text()
+        search = (tmp_path / "report.search.js").read_text()
+        assert '<script src="report.graph.js"></script>' in content
+        assert '<script src="report.search.js"></script>' in content
+        assert "var GRAPH_DATA=" not in content
+        assert "var SEARCH_INDEX_GZ=" not in content
+        assert graph.startswith("var GRAPH_DATA={")
+        assert search.startswith('var SEARCH_INDEX_GZ="')
+        assert content.index("report.graph.js") < content.index(
+            "cytoscape.min.js")
+
+    def test_flat_report_writes_no_data_files(self, tmp_path):
+        """Reports without a DAG section write only the HTML file."""
+        report = _make_flat_report()
+        path = tmp_path / "report.html"
+        write_html_report(report, path, external_data=True)
+        assert [p.name for p in tmp_path.iterdir()] == ["report.html"]
 
 
 class TestGenerateHtmlFromFile:
     """Tests for generate_html_from_file function."""
 
-    def test_reads_json_and_generates_html(self):
+    def test_reads_json_and_generates_html(self, tmp_path):
         """Can read a JSON file and produce HTML."""
-        report = _make_flat_report()
-        with tempfile.TemporaryDirectory() as tmpdir:
-            json_path = Path(tmpdir) / "report.json"
-            with open(json_path, "w") as f:
-                json.dump(report, f)
+        json_path = tmp_path / "report.json"
+        json_path.write_bytes(_FLAT_REPORT_JSON)
 
-            result = generate_html_from_file(json_path)
-            assert "<!DOCTYPE html>" in result
-            assert "test_a" in result
+        result = generate_html_from_file(json_path)
+        assert "<!DOCTYPE html>" in result
+        assert "test_a" in result
 
     def test_missing_file_raises(self):
         """Missing report file raises FileNotFoundError."""
@@ -542,6 +660,21 @@ class TestHtmlEscaping:
         assert "&lt;b&gt;" in result
         assert "&amp;" in result
 
+    def test_history_commit_escaped(self):
+        """Commit SHAs in the history timeline go through the escape cache."""
+        tests = [{"name": "t", "status": "passed", "duration_seconds": 1.0}]
+        report = _make_flat_report(tests=tests)
+        report["report"]["history"] = {
+            "t": [{"status": "passed", "commit": "<b>&sha"}],
+        }
+        result = generate_html_report(report)
+        assert 'title="&lt;b&gt;&amp;sha"' in result
+
+    def test_esc_matches_html_escape(self):
+        """Memoized escape returns the same result on repeated calls."""
+        assert _esc('a<b>"c"&') == "a&lt;b&gt;&quot;c&quot;&amp;"
+        assert _esc('a<b>"c"&') == "a&lt;b&gt;&quot;c&quot;&amp;"
+
 
 class TestHistoryTimeline:
     """Tests for pass/fail history timeline rendering."""
@@ -551,14 +684,13 @@ class TestHistoryTimeline:
         statuses: list[str],
         commits: list[str] | None = None,
     ) -> list[dict]:
-        entries = []
-        for i, status in enumerate(statuses):
-            entry: dict = {"status": status, "duration_seconds": 1.0,
-                           "timestamp": f"2026-01-0{i + 1}T00:00:00+00:00"}
-            if commits and i < len(commits):
-                entry["commit"] = commits[i]
-            entries.append(entry)
-        return entries
+        commits = commits or []
+        return [
+            {"status": status, "duration_seconds": 1.0,
+             "timestamp": f"2026-01-0{i + 1}T00:00:00+00:00",
+             **({"commit": commits[i]} if i < len(commits) else {})}
+            for i, status in enumerate(statuses)
+        ]
 
     def test_timeline_rendered_for_flat_report_with_history(self):
         """History timeline appears when history data is present."""
@@ -573,10 +705,9 @@ class TestHistoryTimeline:
         assert "history-timeline" in result
         assert "ht-box" in result
 
-    def test_timeline_not_rendered_without_history(self):
+    def test_timeline_not_rendered_without_history(self, default_flat_html):
         """No timeline div when history data is absent."""
-        report = _make_flat_report()
-        result = generate_html_report(report)
+        result = default_flat_html
         assert 'class="history-timeline"' not in result
 
     def test_timeline_shows_correct_colors(self):
@@ -735,13 +866,13 @@ class TestHistoryTimeline:
         # The wrapper should not have a title attribute
         assert 'class="ht-commit ht-commit-a">' in result
 
-    def test_commit_css_classes_present(self):
+    def test_commit_css_classes_present(self, default_flat_html):
         """Commit group CSS classes are defined in the stylesheet."""
-        report = _make_flat_report()
-        result = generate_html_report(report)
-        assert ".ht-commit" in result
-        assert ".ht-commit-a" in result
-        assert ".ht-commit-b" in result
+        result = default_flat_html
+        _assert_contains_all(
+            result,
+            ".ht-commit", ".ht-commit-a", ".ht-commit-b",
+        )
 
 
 class TestLifecycleRendering:
@@ -789,10 +920,10 @@ class TestLifecycleRendering:
             "aggregate_reliability": 0.99,
         }
         result = generate_html_report(report)
-        assert "lifecycle-summary" in result
-        assert "2 STABLE" in result
-        assert "1 BURNING IN" in result
-        assert "99.0%" in result
+        _assert_contains_all(
+            result,
+            "lifecycle-summary", "2 STABLE", "1 BURNING IN", "99.0%",
+        )
 
     def test_lifecycle_summary_omits_zero_counts(self):
         """Zero-count states are not shown in summary."""
@@ -823,34 +954,35 @@ class TestLifecycleRendering:
             "statistical_significance": 0.95,
         }
         result = generate_html_report(report)
-        assert "lifecycle-config-note" in result
-        assert "99%" in result
-        assert "95%" in result
+        _assert_contains_all(result, "lifecycle-config-note", "99%", "95%")
 
-    def test_lifecycle_badge_colors(self):
-        """Different lifecycle states use correct colors."""
-        for state, expected_color in [
+    @pytest.mark.parametrize(
+        "state,expected_color",
+        [
             ("stable", LIFECYCLE_COLORS["stable"]),
             ("flaky", LIFECYCLE_COLORS["flaky"]),
             ("burning_in", LIFECYCLE_COLORS["burning_in"]),
             ("new", LIFECYCLE_COLORS["new"]),
             ("disabled", LIFECYCLE_COLORS["disabled"]),
-        ]:
-            tests = {
-                "t": {
-                    "assertion": "A", "status": "passed",
-                    "duration_seconds": 1.0,
-                    "lifecycle": {
-                        "state": state, "runs": 10, "passes": 9,
-                        "reliability": 0.9,
-                    },
+        ],
+    )
+    def test_lifecycle_badge_color(self, state: str, expected_color: str):
+        """Each lifecycle state uses its own badge color."""
+        tests = {
+            "t": {
+                "assertion": "A", "status": "passed",
+                "duration_seconds": 1.0,
+                "lifecycle": {
+                    "state": state, "runs": 10, "passes": 9,
+                    "reliability": 0.9,
                 },
-            }
-            report = _make_hierarchical_report(tests=tests)
-            result = generate_html_report(report)
-            assert expected_color in result, (
-                f"Expected color {expected_color} for state {state}"
-            )
+            },
+        }
+        report = _make_hierarchical_report(tests=tests)
+        result = generate_html_report(report)
+        assert expected_color in result, (
+            f"Expected color {expected_color} for state {state}"
+        )
 
     def test_lifecycle_zero_runs_no_percentage(self):
         """Tests with zero runs show badge but no percentage."""
@@ -924,10 +1056,11 @@ class TestSourceLinksRendering:
         """Source links render as <span> when source_link_base is absent."""
         report = self._make_report_with_source_links()
         result = generate_html_report(report)
-        assert '<span class="source-link">' in result
-        assert "examples/test.py:14" in result
-        assert "examples/test.py:18" in result
-        assert "examples/test.py:22" in result
+        _assert_contains_all(
+            result,
+            '<span class="source-link">', "examples/test.py:14",
+            "examples/test.py:18", "examples/test.py:22",
+        )
 
     def test_no_source_links_without_metadata(self):
         """No rendered source link elements when events lack _file/_line."""
@@ -948,10 +1081,9 @@ class TestSourceLinksRendering:
         # CSS class definition is always present, but no rendered elements
         assert 'class="source-link"' not in result
 
-    def test_source_link_css_present(self):
+    def test_source_link_css_present(self, default_hierarchical_html):
         """Source link CSS class is defined in the stylesheet."""
-        report = _make_hierarchical_report()
-        result = generate_html_report(report)
+        result = default_hierarchical_html
         assert ".source-link" in result
 
     def test_error_source_links_rendered(self):
@@ -973,6 +1105,27 @@ class TestSourceLinksRendering:
         result = generate_html_report(report)
         assert "examples/test.py:7" in result
 
+    def test_repeated_source_location_rendered_per_event(self):
+        """Events sharing a _file/_line each get their own source link."""
+        tests = {
+            "t": {
+                "assertion": "A",
+                "status": "passed",
+                "duration_seconds": 1.0,
+                "stdout": (
+                    '[TST] {"type": "block_start", "block": "stimulation"}\n'
+                    '[TST] {"type": "measurement", "name": "m1", "value": 1, '
+                    '"_file": "examples/test.py", "_line": 30}\n'
+                    '[TST] {"type": "measurement", "name": "m2", "value": 2, '
+                    '"_file": "examples/test.py", "_line": 30}\n'
+                    '[TST] {"type": "block_end", "block": "stimulation"}'
+                ),
+            },
+        }
+        report = _make_hierarchical_report(tests=tests)
+        result = generate_html_report(report)
+        assert result.count("examples/test.py:30") == 2
+
     def test_measurements_table_has_source_column(self):
         """Measurements table includes a Source column header."""
         base = "https://github.com/owner/repo/blob/abc123"
@@ -1034,99 +1187,120 @@ def _make_dag_report() -> dict:
     }
 
 
+@pytest.fixture(scope="session")
+def dag_report_html() -> str:
+    """HTML for _make_dag_report(), rendered once per session."""
+    return generate_html_report(_make_dag_report())
+
+
+@pytest.fixture(scope="module")
+def dag_graph(dag_report_html: str) -> tuple[str, dict]:
+    """The canonical DAG report's HTML and its parsed GRAPH_DATA."""
+    return dag_report_html, json.loads(_extract_graph_json(dag_report_html))
+
+
 class TestDagVisualization:
     """Tests for the interactive DAG visualization section."""
 
-    def test_dag_section_present_for_hierarchical_report(self):
+    def test_dag_section_present_for_hierarchical_report(self, dag_report_html):
         """DAG section appears when report has a test_set."""
-        report = _make_dag_report()
-        result = generate_html_report(report)
+        result = dag_report_html
         assert 'class="dag-section"' in result
         assert 'id="dag-canvas"' in result
 
-    def test_dag_section_absent_for_flat_report(self):
+    def test_dag_section_absent_for_flat_report(self, default_flat_html):
         """DAG section does not appear for flat (non-hierarchical) reports."""
-        report = _make_flat_report()
-        result = generate_html_report(report)
+        result = default_flat_html
         assert "dag-section" not in result
 
-    def test_graph_data_embedded(self):
+    def test_graph_data_embedded(self, dag_report_html):
         """GRAPH_DATA JavaScript variable is embedded."""
-        report = _make_dag_report()
-        result = generate_html_report(report)
+        result = dag_report_html
         assert "var GRAPH_DATA=" in result
 
-    def test_cytoscape_cdn_included(self):
+    def test_cytoscape_cdn_included(self, dag_report_html):
         """Cytoscape.js CDN script tag is present."""
-        report = _make_dag_report()
-        result = generate_html_report(report)
-        assert "cytoscape.min.js" in result
-        assert "dagre.min.js" in result
-        assert "cytoscape-dagre.js" in result
+        result = dag_report_html
+        _assert_contains_all(
+            result,
+            "cytoscape.min.js", "dagre.min.js", "cytoscape-dagre.js",
+        )
+
+    def test_webgl_renderer_for_large_graphs(self, dag_report_html):
+        """Large graphs opt into the WebGL renderer (Cytoscape >= 3.31)."""
+        result = dag_report_html
+        _assert_contains_all(
+            result,
+            "cytoscape@3.31.0", "WEBGL_MIN_ELEMENTS", "webgl: useWebgl",
+        )
 
-    def test_nodes_include_test_names(self):
+    def test_nodes_include_test_names(self, dag_report_html):
         """Graph data contains nodes for all tests and groups."""
-        report = _make_dag_report()
-        result = generate_html_report(report)
-        assert '"test_a"' in result
-        assert '"test_b"' in result
-        assert '"test_c"' in result
-        assert '"root_set"' in result
-        assert '"child_set"' in result
+        result = dag_report_html
+        _assert_contains_all(
+            result,
+            '"test_a"', '"test_b"', '"test_c"', '"root_set"', '"child_set"',
+        )
 
-    def test_edges_reflect_depends_on(self):
+    def test_edges_reflect_depends_on(self, dag_report_html):
         """Graph data contains dependency edges for depends_on relationships."""
-        report = _make_dag_report()
-        result = generate_html_report(report)
+        result = dag_report_html
         # test_b depends on test_a (dependency edge)
-        assert '"source":"test_b","target":"test_a","type":"dependency"' in result
+        assert '"source":"test_b","target":"test_a"},"classes":"dependency"' in result
         # test_c also depends on test_a
-        assert '"source":"test_c","target":"test_a","type":"dependency"' in result
+        assert '"source":"test_c","target":"test_a"},"classes":"dependency"' in result
 
-    def test_edges_reflect_membership(self):
+    def test_edges_reflect_membership(self, dag_report_html):
         """Graph data contains membership edges from sets to their members."""
-        report = _make_dag_report()
-        result = generate_html_report(report)
+        result = dag_report_html
         # root_set contains test_a and test_b
-        assert '"source":"root_set","target":"test_a","type":"member"' in result
-        assert '"source":"root_set","target":"test_b","type":"member"' in result
+        assert '"source":"root_set","target":"test_a"},"classes":"member"' in result
+        assert '"source":"root_set","target":"test_b"},"classes":"member"' in result
         # root_set contains child_set
-        assert '"source":"root_set","target":"child_set","type":"member"' in result
+        assert '"source":"root_set","target":"child_set"},"classes":"member"' in result
         # child_set contains test_c
-        assert '"source":"child_set","target":"test_c","type":"member"' in result
+        assert '"source":"child_set","target":"test_c"},"classes":"member"' in result
 
-    def test_toolbar_buttons_present(self):
+    def test_toolbar_buttons_present(self, dag_report_html):
         """Toolbar with zoom and fit buttons is present."""
-        report = _make_dag_report()
-        result = generate_html_report(report)
-        assert 'id="dag-zoom-in"' in result
-        assert 'id="dag-zoom-out"' in result
-        assert 'id="dag-fit"' in result
+        result = dag_report_html
+        _assert_contains_all(
+            result,
+            'id="dag-zoom-in"', 'id="dag-zoom-out"', 'id="dag-fit"',
+        )
 
-    def test_detail_pane_present(self):
+    def test_detail_pane_present(self, dag_report_html):
         """Detail pane with content div is present."""
-        report = _make_dag_report()
-        result = generate_html_report(report)
+        result = dag_report_html
         assert 'id="dag-detail"' in result
         assert 'id="dag-detail-content"' in result
 
-    def test_handles_empty_depends_on(self):
-        """DAG section renders correctly when no test has dependency edges."""
-        report = _make_hierarchical_report()
+    def test_dangling_dependency_edge_dropped(self):
+        """depends_on targets that are not in the graph get no edge."""
+        report = _make_dag_report()
+        root = report["report"]["test_set"]
+        root["tests"]["test_b"]["depends_on"] = ["test_a", "//other:missing"]
         result = generate_html_report(report)
+        assert '"source":"test_b","target":"test_a"' in result
+        assert '"target":"//other:missing"' not in result
+
+    def test_handles_empty_depends_on(self, default_hierarchical_html):
+        """DAG section renders correctly when no test has dependency edges."""
+        result = default_hierarchical_html
         assert 'class="dag-section"' in result
         # Only membership edges, no dependency edges
-        assert '"type":"dependency"' not in result
-        assert '"type":"member"' in result
+        assert '"classes":"dependency"' not in result
+        assert '"classes":"member"' in result
 
-    def test_detail_pane_clones_rendered_test_entry(self):
+    def test_detail_pane_clones_rendered_test_entry(self, dag_report_html):
         """DAG detail JS finds test entries by data-test-name attribute."""
-        report = _make_dag_report()
-        result = generate_html_report(report)
+        result = dag_report_html
         # Test entries have data-test-name attributes for JS to find
-        assert 'data-test-name="test_a"' in result
-        assert 'data-test-name="test_b"' in result
-        assert 'data-test-name="test_c"' in result
+        _assert_contains_all(
+            result,
+            'data-test-name="test_a"', 'data-test-name="test_b"',
+            'data-test-name="test_c"',
+        )
         # JS uses querySelectorAll with data-test-name
         assert "data-test-name" in result
         assert "dag-detail-content" in result
@@ -1190,41 +1364,33 @@ class TestDagVisualization:
         result = generate_html_report(report)
         assert '"lifecycle":"flaky"' in result
 
-    def test_lifecycle_state_empty_when_absent(self):
+    def test_lifecycle_state_empty_when_absent(self, dag_report_html):
         """Graph data has empty lifecycle when test has no lifecycle."""
-        report = _make_dag_report()
-        result = generate_html_report(report)
+        result = dag_report_html
         assert '"lifecycle":""' in result
 
-    def test_group_node_rounded_border_style(self):
+    def test_group_node_rounded_border_style(self, dag_report_html):
         """Group nodes use rounded shape with soft border."""
-        report = _make_dag_report()
-        result = generate_html_report(report)
+        result = dag_report_html
         assert "'corner-radius': 30" in result
         assert "'border-color': '#888'" in result
 
-    def test_lifecycle_icons_in_js(self):
+    def test_lifecycle_icons_in_js(self, dag_report_html):
         """Lifecycle icon mapping is present in the JS."""
-        report = _make_dag_report()
-        result = generate_html_report(report)
+        result = dag_report_html
         assert "LIFECYCLE_ICONS" in result
 
-    def test_dag_color_all_passed(self):
+    def test_dag_color_all_passed(self, default_hierarchical_html):
         """Set node is green when all children passed."""
-        report = _make_hierarchical_report(status="passed")
-        result = generate_html_report(report)
+        result = default_hierarchical_html
         # The single test is passed → green; the set aggregates → green
         assert '"dag_color":"green"' in result
 
-    def test_dag_color_any_failed_propagates_red(self):
+    def test_dag_color_any_failed_propagates_red(self, dag_graph):
         """Set node is red when any child is red."""
-        report = _make_dag_report()
-        result = generate_html_report(report)
+        _, graph = dag_graph
         # test_c failed → child_set red → root_set red
         # Check that root_set and child_set both get red
-        import json as _json
-        graph_json = result.split("var GRAPH_DATA=")[1].split(";</script>")[0]
-        graph = _json.loads(graph_json)
         colors = {n["data"]["id"]: n["data"]["dag_color"]
                   for n in graph["nodes"]}
         assert colors["test_a"] == "green"
@@ -1233,6 +1399,35 @@ class TestDagVisualization:
         assert colors["child_set"] == "red"
         assert colors["root_set"] == "red"
 
+    def test_graph_elements_carry_classes(self, dag_graph):
+        """Element kinds are carried once, as Cytoscape classes."""
+        result, graph = dag_graph
+        classes = {n["data"]["id"]: n["classes"] for n in graph["nodes"]}
+        assert classes["root_set"] == "group"
+        assert classes["test_a"] == "test"
+        assert {e["classes"] for e in graph["edges"]} <= {"member", "dependency"}
+        for element in graph["nodes"] + graph["edges"]:
+            assert "type" not in element["data"]
+        assert "elements: GRAPH_DATA," in result
+
+    def test_workspace_root_not_in_graph(self):
+        """The synthetic Workspace root and its member edges are omitted."""
+        report = _make_dag_report()
+        root = report["report"]["test_set"]
+        report["report"]["test_set"] = {
+            "name": "Workspace",
+            "status": root["status"],
+            "tests": {"test_w": {"status": "not_run"}},
+            "subsets": [root],
+        }
+        result = generate_html_report(report)
+        graph = json.loads(_extract_graph_json(result))
+        ids = {n["data"]["id"] for n in graph["nodes"]}
+        assert "Workspace" not in ids
+        assert {"test_w", "root_set"} <= ids
+        for e in graph["edges"]:
+            assert "Workspace" not in (e["data"]["source"], e["data"]["target"])
+
     def test_dag_color_all_grey(self):
         """Set node is grey when all children are grey."""
         report = {
@@ -1258,9 +1453,7 @@ class TestDagVisualization:
             },
         }
         result = generate_html_report(report)
-        import json as _json
-        graph_json = result.split("var GRAPH_DATA=")[1].split(";</script>")[0]
-        graph = _json.loads(graph_json)
+        graph = json.loads(_extract_graph_json(result))
         colors = {n["data"]["id"]: n["data"]["dag_color"]
                   for n in graph["nodes"]}
         assert colors["test_x"] == "grey"
@@ -1297,44 +1490,33 @@ class TestDagVisualization:
             },
         }
         result = generate_html_report(report)
-        import json as _json
-        graph_json = result.split("var GRAPH_DATA=")[1].split(";</script>")[0]
-        graph = _json.loads(graph_json)
+        graph = json.loads(_extract_graph_json(result))
         colors = {n["data"]["id"]: n["data"]["dag_color"]
                   for n in graph["nodes"]}
         assert colors["test_ok"] == "green"
         assert colors["test_skip"] == "grey"
         assert colors["suite"] == "green"
 
-    def test_set_summary_cards_have_data_set_name(self):
+    def test_set_summary_cards_have_data_set_name(self, dag_report_html):
         """Hidden set summary cards carry data-set-name for each set."""
-        report = _make_dag_report()
-        result = generate_html_report(report)
+        result = dag_report_html
         assert 'data-set-name="root_set"' in result
         assert 'data-set-name="child_set"' in result
 
-    def test_group_node_click_handler_in_js(self):
+    def test_group_node_click_handler_in_js(self, dag_report_html):
         """JS includes a tap handler for node.group to populate detail pane."""
-        report = _make_dag_report()
-        result = generate_html_report(report)
+        result = dag_report_html
         assert "node.group" in result
         assert "data-set-name" in result
 
-    def test_set_summary_card_contains_assertion(self):
+    def test_set_summary_card_contains_assertion(self, dag_report_html):
         """Hidden set summary card includes the set's assertion text."""
-        report = _make_dag_report()
-        result = generate_html_report(report)
-        # Extract the hidden card for root_set
-        marker = 'data-set-name="root_set"'
-        idx = result.index(marker)
-        # The card's closing </div> is within a reasonable distance
-        card_snippet = result[idx:idx + 500]
-        assert "Root assertion" in card_snippet
+        result = dag_report_html
+        assert "Root assertion" in _set_cards(result)["root_set"]
 
-    def test_set_summary_card_hidden_by_default(self):
+    def test_set_summary_card_hidden_by_default(self, dag_report_html):
         """Hidden set summary cards use display:none."""
-        report = _make_dag_report()
-        result = generate_html_report(report)
+        result = dag_report_html
         assert 'data-set-name="root_set" style="display:none"' in result
 
     def test_set_summary_card_includes_lifecycle_summary(self):
@@ -1347,9 +1529,7 @@ class TestDagVisualization:
             "aggregate_reliability": 0.983,
         }
         result = generate_html_report(report)
-        marker = 'data-set-name="root_set"'
-        idx = result.index(marker)
-        card_snippet = result[idx:idx + 1000]
+        card_snippet = _set_cards(result)["root_set"]
         assert "2 STABLE" in card_snippet
         assert "1 FLAKY" in card_snippet
         assert "98.3%" in card_snippet
@@ -1379,9 +1559,7 @@ class TestDagVisualization:
         }
         result = generate_html_report(report)
         # root_set contains test_a, test_b and child_set (which has test_c)
-        marker = 'data-set-name="root_set"'
-        idx = result.index(marker)
-        card_snippet = result[idx:idx + 2000]
+        card_snippet = _set_cards(result)["root_set"]
         # Should have a history timeline inside the card
         assert "history-timeline" in card_snippet
         # commit aaa: all passed → green (#2da44e)
@@ -1389,14 +1567,10 @@ class TestDagVisualization:
         # commit bbb: test_b failed → red (#cf222e)
         assert "#cf222e" in card_snippet
 
-    def test_set_summary_card_no_history_without_data(self):
+    def test_set_summary_card_no_history_without_data(self, dag_report_html):
         """Set summary card has no timeline when no history is present."""
-        report = _make_dag_report()
-        result = generate_html_report(report)
-        marker = 'data-set-name="root_set"'
-        idx = result.index(marker)
-        card_snippet = result[idx:idx + 1000]
-        assert "history-timeline" not in card_snippet
+        result = dag_report_html
+        assert "history-timeline" not in _set_cards(result)["root_set"]
 
     def test_set_history_aggregates_child_set_tests(self):
         """Set history includes tests from nested child sets."""
@@ -1410,9 +1584,7 @@ class TestDagVisualization:
             ],
         }
         result = generate_html_report(report)
-        marker = 'data-set-name="root_set"'
-        idx = result.index(marker)
-        card_snippet = result[idx:idx + 2000]
+        card_snippet = _set_cards(result)["root_set"]
         assert "history-timeline" in card_snippet
         # test_c failed → root_set should show red
         assert "#cf222e" in card_snippet
@@ -1435,13 +1607,9 @@ class TestDagVisualization:
             ],
         }
         result = generate_html_report(report)
-        marker = 'data-set-name="root_set"'
-        idx = result.index(marker)
-        # Narrow to just the hidden card (ends at first closing </div> sequence)
-        end_marker = "history-timeline"
-        timeline_idx = result.index(end_marker, idx)
-        # Grab enough to cover the timeline div but not the test entries
-        card_snippet = result[timeline_idx:timeline_idx + 300]
+        # The card ends before the test entries, whose own timelines
+        # would add ht-box elements of their own
+        card_snippet = _set_cards(result)["root_set"]
         # Should have two ht-box elements (one per run), not one
         assert card_snippet.count("ht-box") == 2
         # Run 1: all passed → green; Run 2: test_b failed → red
@@ -1463,16 +1631,14 @@ class TestParametersRendering:
             },
         })
         result = generate_html_report(report)
-        assert "Parameter" in result
-        assert "Value" in result
-        assert "service" in result
-        assert "worker" in result
-        assert "limit-gb" in result
+        _assert_contains_all(
+            result,
+            "Parameter", "Value", "service", "worker", "limit-gb",
+        )
 
-    def test_no_parameters_table_without_data(self):
+    def test_no_parameters_table_without_data(self, default_hierarchical_html):
         """No parameters table when test has no parameters."""
-        report = _make_hierarchical_report()
-        result = generate_html_report(report)
+        result = default_hierarchical_html
         assert "Parameter</th>" not in result
 
     def test_parameters_in_graph_data(self):
@@ -1526,10 +1692,10 @@ class TestHashFilterSection:
             }
         }
         result = generate_html_report(report)
-        assert "Hash-Based Filtering" in result
-        assert "Changed" in result
-        assert "Unchanged" in result
-        assert "Skipped" in result
+        _assert_contains_all(
+            result,
+            "Hash-Based Filtering", "Changed", "Unchanged", "Skipped",
+        )
 
     def test_hash_filter_not_rendered_when_absent(self):
         """Hash filter section not rendered when data is absent."""
@@ -1589,6 +1755,20 @@ class TestBurnInSweepSection:
         assert "Burn-in sweep" in result
         assert "8 runs" in result
 
+    def test_sweep_unknown_state_independent_of_prior_renders(self):
+        """Unknown sweep states keep their fallback after other renders."""
+        _render_lifecycle_badge(io.StringIO(), {"state": "retired"})
+        out = io.StringIO()
+        _render_effort_section(out, {
+            "mode": "converge",
+            "burn_in_sweep": {
+                "total_runs": 1,
+                "decided": {"//test:a": "retired"},
+                "undecided": [],
+            },
+        })
+        assert 'background:#FFFFFF">retired</span>' in out.getvalue()
+
     def test_effort_without_sweep(self):
         """Effort summary renders without sweep data in DAG detail panel."""
         report = {
@@ -1621,3 +1801,61 @@ class TestBurnInSweepSection:
         assert "Effort Classification" in result
         assert "converge" in result
         assert "Burn-in sweep" not in result
+
+
+def _flat_report_of(n: int) -> dict:
+    return _make_flat_report(tests=[
+        {"name": f"test_{i}", "status": "passed",
+         "duration_seconds": 1.0, "stdout": f"line {i}\n" * 5}
+        for i in range(n)
+    ])
+
+
+def _hierarchical_report_of(n: int) -> dict:
+    return _make_hierarchical_report(tests={
+        f"test_{i}": {"status": "passed", "duration_seconds": 1.0,
+                      "stdout": f"line {i}\n" * 5}
+        for i in range(n)
+    })
+
+
+class TestScaling:
+    """Rendering work grows linearly with the number of tests."""
+
+    @staticmethod
+    def _render_call_counts(
+        monkeypatch: pytest.MonkeyPatch, report: dict,
+    ) -> collections.Counter[str]:
+        """Calls to each ``_render_*``/``_walk_*`` helper for one render."""
+        counts: collections.Counter[str] = collections.Counter()
+        for name in dir(html_reporter):
+            func = getattr(html_reporter, name)
+            if not (name.startswith(("_render_", "_walk_"))
+                    and callable(func)):
+                continue
+
+            def counted(*args, _name=name, _func=func, **kwargs):
+                counts[_name] += 1
+                return _func(*args, **kwargs)
+
+            monkeypatch.setattr(html_reporter, name, counted)
+        generate_html_report(report)
+        monkeypatch.undo()
+        return counts
+
+    @pytest.mark.parametrize(
+        "make_report", [_flat_report_of, _hierarchical_report_of],
+    )
+    def test_generate_html_scales_linearly(self, monkeypatch, make_report):
+        """10x the tests makes per-test helpers run exactly 10x as often."""
+        small = self._render_call_counts(monkeypatch, make_report(100))
+        large = self._render_call_counts(monkeypatch, make_report(1000))
+        assert small["_render_test_entry"] == 100
+        assert large.keys() == small.keys()
+        for name, count in small.items():
+            # Section helpers run once per report, per-test helpers
+            # once per test; nothing may grow faster than the input.
+            assert large[name] in (count, 10 * count), (
+                f"{name}: {count} calls for 100 tests, "
+                f"{large[name]} for 1000"
+            )
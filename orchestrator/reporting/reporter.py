@@ -24,6 +24,7 @@ from __future__ import annotations
 
 import datetime
 import json
+from collections import deque
 from pathlib import Path
 from typing import Any
 
@@ -70,6 +71,9 @@ def _execution_status_to_verdict(status: str) -> str:
 # Maximum rolling history entries per test
 MAX_HISTORY = 500
 
+# Write buffer for JSON report files
+_WRITE_BUFFER_SIZE = 1 << 20
+
 
 class Reporter:
     """Collects test results and generates JSON reports.
@@ -98,6 +102,8 @@ class Reporter:
         self.execution_scope: set[str] | None = None
         self.execution_mode: str | None = None
         self.status_file_history: dict[str, list[dict[str, Any]]] | None = None
+        # Formatted results by id(result), alive for one hierarchical build
+        self._format_cache: dict[int, dict[str, Any]] = {}
 
     def set_manifest(self, manifest: dict[str, Any]) -> None:
         """Set the manifest for hierarchical report generation.
@@ -349,13 +355,20 @@ class Reporter:
 
         # Append current results to history (skip pure dependency-cascade
         # results since those tests didn't actually execute)
+        # Appends go to bounded deques so eviction past MAX_HISTORY is O(1);
+        # they are turned back into lists for the JSON report below.
         history: dict[str, list[dict[str, Any]]] = dict(existing_history)
+        appended: dict[str, deque[dict[str, Any]]] = {}
         for result in self.results:
             if result.status == "dependencies_failed":
                 continue
 
-            if result.name not in history:
-                history[result.name] = []
+            entries = appended.get(result.name)
+            if entries is None:
+                entries = deque(
+                    history.get(result.name, ()), maxlen=MAX_HISTORY,
+                )
+                appended[result.name] = entries
 
             entry = {
                 "status": _execution_status_to_verdict(result.status),
@@ -365,12 +378,10 @@ class Reporter:
             if self.commit_hash:
                 entry["commit"] = self.commit_hash
 
-            history[result.name].append(entry)
-
-            # Trim to MAX_HISTORY
-            if len(history[result.name]) > MAX_HISTORY:
-                history[result.name] = history[result.name][-MAX_HISTORY:]
+            entries.append(entry)
 
+        for name, entries in appended.items():
+            history[name] = list(entries)
         report["report"]["history"] = history
 
         # Update lifecycle reliability from accumulated history so the
@@ -508,30 +519,32 @@ class Reporter:
         ]
         node["status"] = _aggregate_status(direct_statuses + subset_statuses)
 
-    def write_report(self, path: Path) -> None:
+    def write_report(self, path: Path, *, indent: int | None = 2) -> None:
         """Write the report as a JSON file.
 
         Args:
             path: File path to write the JSON report to.
+            indent: JSON indentation; ``None`` writes compact JSON, which
+                is smaller and faster for large reports.
         """
-        report = self.generate_report()
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w") as f:
-            json.dump(report, f, indent=2)
+        _write_json(path, self.generate_report(), indent)
 
     def write_report_with_history(
-        self, path: Path, existing_path: Path | None = None,
+        self,
+        path: Path,
+        existing_path: Path | None = None,
+        *,
+        indent: int | None = 2,
     ) -> None:
         """Write report with rolling history as JSON.
 
         Args:
             path: File path to write.
             existing_path: Path to existing report for history (optional).
+            indent: JSON indentation; ``None`` writes compact JSON.
         """
         report = self.generate_report_with_history(existing_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w") as f:
-            json.dump(report, f, indent=2)
+        _write_json(path, report, indent)
 
     def _build_hierarchical_report(self) -> dict[str, Any]:
         """Build a hierarchical report mirroring the DAG structure.
@@ -553,16 +566,22 @@ class Reporter:
         for r in self.results:
             results_by_name[r.name] = r
 
-        # New tree-aware path
+        # Tests shared between subsets format their result only once
+        self._format_cache = {}
+
         if "subsets" in test_set_info:
-            return self._build_report_node(
+            # New tree-aware path
+            node = self._build_report_node(
+                test_set_info, test_set_tests, results_by_name,
+            )
+        else:
+            # Fallback: old flat manifest (no subsets field)
+            node = self._build_flat_report_node(
                 test_set_info, test_set_tests, results_by_name,
             )
 
-        # Fallback: old flat manifest (no subsets field)
-        return self._build_flat_report_node(
-            test_set_info, test_set_tests, results_by_name,
-        )
+        self._format_cache = {}
+        return node
 
     def _build_report_node(
         self,
@@ -681,7 +700,11 @@ class Reporter:
 
         if name in results_by_name:
             result = results_by_name[name]
-            entry.update(self._format_result(result))
+            formatted = self._format_cache.get(id(result))
+            if formatted is None:
+                formatted = self._format_result(result)
+                self._format_cache[id(result)] = formatted
+            entry.update(formatted)
             entry.pop("name", None)
         else:
             if self.execution_scope is not None and name in self.execution_scope:
@@ -772,16 +795,16 @@ class Reporter:
         Returns:
             Dictionary with verdict state counts and total duration.
         """
+        # One pass over the results gathers verdict counts and duration.
+        # The duration starts as an int, as sum() did, so an empty report
+        # still serializes 0 rather than 0.0.
         success = 0
-        failed = 0
+        total_duration: float = 0
         for r in self.results:
-            verdict = _execution_status_to_verdict(r.status)
-            if verdict == "success":
+            if _execution_status_to_verdict(r.status) == "success":
                 success += 1
-            else:
-                failed += 1
-
-        total_duration = sum(r.duration for r in self.results)
+            total_duration += r.duration
+        failed = len(self.results) - success
 
         missing_result = 0
         undecided = 0
@@ -849,6 +872,148 @@ class Reporter:
         return entry
 
 
+class StreamingReporter(Reporter):
+    """Reporter that streams flat test entries to an NDJSON shard.
+
+    ``add_result()`` formats each result as it arrives and appends it to
+    ``shard_path`` as one JSON line, keeping only running summary counters
+    in memory.  ``write_report()`` then emits the report envelope around
+    the shard's lines, so neither the results nor the serialized report
+    are ever held in memory at once.
+
+    Only flat reports are supported: hierarchical reports and rolling
+    history need every result at once, so ``set_manifest()`` and the
+    history methods raise ``ValueError``.  Entries are formatted on
+    arrival, so call ``set_commit_hash()`` before adding results.
+    """
+
+    def __init__(self, shard_path: Path) -> None:
+        super().__init__()
+        self.shard_path = shard_path
+        shard_path.parent.mkdir(parents=True, exist_ok=True)
+        self._shard = open(shard_path, "w", buffering=_WRITE_BUFFER_SIZE)
+        self._count = 0
+        self._success = 0
+        self._total_duration: float = 0
+
+    def set_manifest(self, manifest: dict[str, Any]) -> None:
+        raise ValueError("StreamingReporter only produces flat reports")
+
+    def add_result(self, result: TestResult) -> None:
+        """Format a result and append it to the shard.
+
+        Args:
+            result: TestResult object from test execution.
+        """
+        self._shard.write(json.dumps(self._format_result(result)))
+        self._shard.write("\n")
+        self._count += 1
+        if _execution_status_to_verdict(result.status) == "success":
+            self._success += 1
+        self._total_duration += result.duration
+
+    def add_results(self, results: list[TestResult]) -> None:
+        """Format multiple results and append them to the shard.
+
+        Args:
+            results: List of TestResult objects.
+        """
+        for result in results:
+            self.add_result(result)
+
+    def generate_report(self) -> dict[str, Any]:
+        """Generate the report data structure, loading the shard's entries.
+
+        Returns:
+            Dictionary representing the full report.
+        """
+        report = super().generate_report()
+        self._shard.flush()
+        with open(self.shard_path) as f:
+            report["report"]["tests"] = [json.loads(line) for line in f]
+        return report
+
+    def generate_report_with_history(
+        self, existing_report_path: Path | None = None,
+    ) -> dict[str, Any]:
+        raise ValueError("StreamingReporter does not support rolling history")
+
+    def write_report(self, path: Path, *, indent: int | None = 2) -> None:
+        """Write the report as a JSON file, copying entries from the shard.
+
+        The output is identical to ``Reporter.write_report()`` with the
+        same ``indent``.  Compact output copies the shard lines verbatim;
+        indented output re-encodes one entry at a time.
+
+        Args:
+            path: File path to write the JSON report to.
+            indent: JSON indentation; ``None`` writes compact JSON.
+        """
+        # generate_report() of the base class sees no results and leaves
+        # "tests" empty.  Only generated_at, summary, commit and
+        # source_link_base precede it, none of which can contain that
+        # key, so the first '"tests": []' is where the entries go.
+        envelope = json.dumps(super().generate_report(), indent=indent)
+        head, _, tail = envelope.partition('"tests": []')
+        if indent is None:
+            newline, separator, closing = "", ", ", "]"
+        else:
+            # Entries sit three levels deep: report, "report", "tests"
+            newline = "\n" + " " * (3 * indent)
+            separator = "," + newline
+            closing = "\n" + " " * (2 * indent) + "]"
+        self._shard.flush()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with (
+            open(self.shard_path) as shard,
+            open(path, "w", buffering=_WRITE_BUFFER_SIZE) as f,
+        ):
+            f.write(head)
+            f.write('"tests": [')
+            count = 0
+            for line in shard:
+                f.write(separator if count else newline)
+                if indent is None:
+                    f.write(line.rstrip("\n"))
+                else:
+                    entry = json.dumps(json.loads(line), indent=indent)
+                    f.write(entry.replace("\n", newline))
+                count += 1
+            f.write(closing if count else "]")
+            f.write(tail)
+
+    def close(self) -> None:
+        """Close the shard file."""
+        self._shard.close()
+
+    def __enter__(self) -> StreamingReporter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _compute_summary(self) -> dict[str, Any]:
+        """Build the summary from the running counters."""
+        return {
+            "total": self._count,
+            "success": self._success,
+            "failed": self._count - self._success,
+            "total_duration_seconds": round(self._total_duration, 3),
+        }
+
+
+def _write_json(path: Path, report: dict[str, Any], indent: int | None) -> None:
+    """Stream ``report`` to ``path`` as JSON.
+
+    The encoder's chunks go straight into a large write buffer, so the
+    document is never held as one string and the file sees few writes.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", buffering=_WRITE_BUFFER_SIZE) as f:
+        for chunk in json.JSONEncoder(indent=indent).iterencode(report):
+            f.write(chunk)
+
+
 def _aggregate_status(statuses: list[str]) -> str:
     """Aggregate child verdict states into a parent verdict.
 
@@ -3,14 +3,18 @@
 from __future__ import annotations
 
 import json
+import re
 import tempfile
 from pathlib import Path
 
+import pytest
+
 from orchestrator.execution.executor import TestResult
 from orchestrator.reporting.reporter import (
     MAX_HISTORY,
     VALID_VERDICT_STATES,
     Reporter,
+    StreamingReporter,
     _aggregate_status,
     _execution_status_to_verdict,
 )
@@ -30,6 +34,7 @@ class TestReporterBasics:
         assert summary["success"] == 0
         assert summary["failed"] == 0
         assert report["report"]["tests"] == []
+        assert json.dumps(summary["total_duration_seconds"]) == "0"
 
     def test_add_result(self):
         """Single result is added and reflected in report."""
@@ -340,6 +345,27 @@ class TestJsonOutput:
             reporter.write_report(path)
             assert path.exists()
 
+    def test_json_output_compact_indent(self):
+        """indent=None writes compact JSON with the same content."""
+        reporter = Reporter()
+        reporter.add_result(
+            TestResult(name="a", assertion="A", status="passed", duration=1.0)
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pretty_path = Path(tmpdir) / "pretty.json"
+            compact_path = Path(tmpdir) / "compact.json"
+            reporter.write_report(pretty_path)
+            reporter.write_report(compact_path, indent=None)
+
+            compact_text = compact_path.read_text()
+            assert "\n" not in compact_text
+            pretty = json.loads(pretty_path.read_text())
+            compact = json.loads(compact_text)
+            pretty["report"].pop("generated_at")
+            compact["report"].pop("generated_at")
+            assert compact == pretty
+
     def test_json_output_roundtrip(self):
         """JSON output can be loaded and matches generated report."""
         reporter = Reporter()
@@ -581,6 +607,36 @@ class TestNestedSubsets:
         assert test_set["status"] == "failed"
         assert test_set["subsets"][0]["status"] == "failed"
 
+    def test_shared_test_formatted_once(self, monkeypatch):
+        """A test listed in two subsets formats its result once per build."""
+        manifest = json.loads(json.dumps(NESTED_MANIFEST))
+        manifest["test_set"]["subsets"][0]["tests"].append("root_test")
+        reporter = Reporter()
+        reporter.set_manifest(manifest)
+        reporter.add_results([
+            TestResult(name="root_test", assertion="Root test works", status="passed", duration=1.0),
+            TestResult(name="child_test", assertion="Child test works", status="passed", duration=2.0),
+        ])
+        calls: list[str] = []
+        format_result = reporter._format_result
+
+        def counting_format(result):
+            calls.append(result.name)
+            return format_result(result)
+
+        monkeypatch.setattr(reporter, "_format_result", counting_format)
+
+        test_set = reporter.generate_report()["report"]["test_set"]
+        assert sorted(calls) == ["child_test", "root_test"]
+        root_entry = test_set["tests"]["root_test"]
+        shared_entry = test_set["subsets"][0]["tests"]["root_test"]
+        assert shared_entry == root_entry
+        assert shared_entry is not root_entry
+
+        reporter.set_commit_hash("abc123")
+        test_set = reporter.generate_report()["report"]["test_set"]
+        assert test_set["subsets"][0]["tests"]["root_test"]["commit"] == "abc123"
+
     def test_backward_compat_flat_manifest(self):
         """Old manifests without subsets field still work, with empty subsets."""
         reporter = Reporter()
@@ -745,6 +801,36 @@ class TestRollingHistory:
             report = reporter.generate_report_with_history(path)
             assert len(report["report"]["history"]["a"]) == MAX_HISTORY
 
+    def test_rolling_history_keeps_newest_as_list(self):
+        """Trimming drops the oldest entries and the history stays a list."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "report.json"
+            initial = {
+                "report": {
+                    "history": {
+                        "a": [
+                            {"status": "failed", "duration_seconds": 1.0, "timestamp": f"t{i}"}
+                            for i in range(MAX_HISTORY)
+                        ],
+                        "b": [{"status": "passed", "duration_seconds": 1.0}],
+                    },
+                },
+            }
+            with open(path, "w") as f:
+                json.dump(initial, f)
+
+            reporter = Reporter()
+            reporter.add_results([
+                TestResult(name="a", assertion="A", status="passed", duration=0.5),
+            ])
+
+            report = reporter.generate_report_with_history(path)
+            history = report["report"]["history"]
+            assert isinstance(history["a"], list)
+            assert history["a"][0]["timestamp"] == "t1"
+            assert history["a"][-1]["status"] == "success"
+            assert history["b"] == initial["report"]["history"]["b"]
+
     def test_rolling_history_no_existing(self):
         """History works without existing report file."""
         reporter = Reporter()
@@ -1394,3 +1480,115 @@ class TestHashFilterData:
         report = reporter.generate_report()
         assert "hash_filter" not in report["report"]
         assert report["report"]["summary"]["success"] == 1
+
+
+class TestStreamingReporter:
+    """Tests for the NDJSON-backed streaming reporter."""
+
+    RESULTS = [
+        TestResult(
+            name="a", assertion="A", status="passed", duration=1.25,
+            stdout="out", exit_code=0,
+        ),
+        TestResult(
+            name="b", assertion="B", status="failed", duration=0.5,
+            stderr="err", exit_code=1,
+        ),
+        TestResult(
+            name="c", assertion="C", status="dependencies_failed",
+            duration=0.0,
+        ),
+    ]
+
+    @staticmethod
+    def _without_timestamp(report: dict) -> dict:
+        report["report"].pop("generated_at")
+        return report
+
+    def test_add_result_writes_ndjson_shard(self):
+        """Each added result is one formatted JSON line in the shard."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            shard = Path(tmpdir) / "shard.ndjson"
+            reporter = StreamingReporter(shard)
+            reporter.set_commit_hash("abc123")
+            reporter.add_results(self.RESULTS)
+            reporter.close()
+
+            lines = shard.read_text().splitlines()
+            assert [json.loads(line)["name"] for line in lines] == [
+                "a", "b", "c",
+            ]
+            assert json.loads(lines[0])["commit"] == "abc123"
+            assert reporter.results == []
+
+    def test_written_report_matches_reporter(self):
+        """Streamed report file matches the in-memory Reporter's report."""
+        expected_reporter = Reporter()
+        expected_reporter.set_commit_hash("abc123")
+        expected_reporter.set_regression_selection({"changed_files": []})
+        expected_reporter.add_results(self.RESULTS)
+        expected = self._without_timestamp(expected_reporter.generate_report())
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            reporter = StreamingReporter(Path(tmpdir) / "shard.ndjson")
+            reporter.set_commit_hash("abc123")
+            reporter.set_regression_selection({"changed_files": []})
+            reporter.add_results(self.RESULTS)
+
+            path = Path(tmpdir) / "out" / "report.json"
+            reporter.write_report(path)
+            loaded = self._without_timestamp(json.loads(path.read_text()))
+            generated = self._without_timestamp(reporter.generate_report())
+            reporter.close()
+
+        assert loaded == expected
+        assert generated == expected
+
+    def test_empty_report(self):
+        """A reporter with no results writes an empty tests list."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            reporter = StreamingReporter(Path(tmpdir) / "shard.ndjson")
+            path = Path(tmpdir) / "report.json"
+            reporter.write_report(path)
+            reporter.close()
+            loaded = json.loads(path.read_text())
+        assert loaded["report"]["tests"] == []
+        assert loaded["report"]["summary"]["total"] == 0
+
+    @pytest.mark.parametrize("indent", [2, None])
+    @pytest.mark.parametrize("with_results", [True, False])
+    def test_written_file_identical_to_reporter(self, indent, with_results):
+        """Streamed output is byte-identical to Reporter.write_report()."""
+        results = self.RESULTS if with_results else []
+        timestamp = re.compile(r'"generated_at": "[^"]*"')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            expected_path = Path(tmpdir) / "expected.json"
+            expected_reporter = Reporter()
+            expected_reporter.add_results(results)
+            expected_reporter.write_report(expected_path, indent=indent)
+
+            path = Path(tmpdir) / "report.json"
+            with StreamingReporter(Path(tmpdir) / "shard.ndjson") as reporter:
+                reporter.add_results(results)
+                reporter.write_report(path, indent=indent)
+
+            expected = timestamp.sub("", expected_path.read_text())
+            assert timestamp.sub("", path.read_text()) == expected
+
+    def test_context_manager_closes_shard(self):
+        """Leaving the with block closes the shard, even on error."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(RuntimeError):
+                with StreamingReporter(Path(tmpdir) / "shard.ndjson") as reporter:
+                    raise RuntimeError("boom")
+            assert reporter._shard.closed
+
+    def test_manifest_and_history_rejected(self):
+        """Hierarchical reports and rolling history are not supported."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            reporter = StreamingReporter(Path(tmpdir) / "shard.ndjson")
+            with pytest.raises(ValueError):
+                reporter.set_manifest(SAMPLE_MANIFEST)
+            with pytest.raises(ValueError):
+                reporter.generate_report_with_history(None)
+            reporter.close()
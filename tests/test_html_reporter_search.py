@@ -7,15 +7,33 @@ presence of search UI elements in the rendered DAG section.
 
 from __future__ import annotations
 
+import base64
+import gzip
+import io
 import json
 
 from orchestrator.reporting.html_reporter import (
     _build_search_index,
+    _columnar_search_index,
     _decompose_identifier,
+    _encode_search_index,
     _render_dag_section,
 )
 
 
+def _render(render_fn, *args, **kwargs) -> str:
+    """Run a writer-style ``_render_*`` helper and return its output."""
+    out = io.StringIO()
+    render_fn(out, *args, **kwargs)
+    return out.getvalue()
+
+
+def _embedded_search_index(html: str) -> dict:
+    """Decode the gzip+base64 ``SEARCH_INDEX_GZ`` payload from a page."""
+    payload = html.split('var SEARCH_INDEX_GZ="')[1].split('";</script>')[0]
+    return json.loads(gzip.decompress(base64.b64decode(payload)))
+
+
 class TestDecomposeIdentifier:
     """Tests for _decompose_identifier."""
 
@@ -281,6 +299,61 @@ class TestBuildSearchIndex:
         assert "ordercreated" in fields["check"]
 
 
+class TestColumnarSearchIndex:
+    """Tests for _columnar_search_index."""
+
+    def test_columns_are_index_aligned(self):
+        ts = {
+            "name": "mySet", "assertion": "set works", "status": "passed",
+            "tests": {
+                "//pkg:t": {
+                    "status": "passed", "depends_on": [],
+                    "assertion": "t works",
+                },
+            },
+            "subsets": [],
+        }
+        index = _build_search_index(ts)
+        columnar = _columnar_search_index(index)
+        assert columnar["ids"] == list(index)
+        for pos, node_id in enumerate(columnar["ids"]):
+            entry = index[node_id]
+            assert columnar["types"][pos] == entry["type"]
+            assert columnar["labels"][pos] == entry["label"]
+            for field, column in columnar["fields"].items():
+                assert column[pos] == entry["fields"].get(field, "")
+
+    def test_set_entries_have_empty_test_only_fields(self):
+        index = {
+            "s": {"type": "group", "label": "s",
+                  "fields": {"name": "s", "assertion": ""}},
+        }
+        columnar = _columnar_search_index(index)
+        assert columnar["fields"]["log"] == [""]
+        assert columnar["fields"]["metric"] == [""]
+
+
+class TestEncodeSearchIndex:
+    """Tests for _encode_search_index."""
+
+    def test_round_trips_to_columnar_index(self):
+        index = {
+            "//pkg:t": {"type": "test", "label": "t",
+                        "fields": {"name": "t", "assertion": "works"}},
+        }
+        encoded = _encode_search_index(index)
+        assert encoded.isascii()
+        decoded = json.loads(gzip.decompress(base64.b64decode(encoded)))
+        assert decoded == _columnar_search_index(index)
+
+    def test_output_is_deterministic(self):
+        index = {
+            "s": {"type": "group", "label": "s",
+                  "fields": {"name": "s", "assertion": ""}},
+        }
+        assert _encode_search_index(index) == _encode_search_index(index)
+
+
 class TestSearchUIRendering:
     """Integration tests for search UI elements in rendered HTML."""
 
@@ -291,7 +364,7 @@ class TestSearchUIRendering:
                 "tests": {}, "subsets": [],
             },
         }
-        result = _render_dag_section(report)
+        result = _render(_render_dag_section, report)
         assert 'id="dag-search"' in result
         assert 'id="dag-search-results"' in result
         assert "dag-search-wrapper" in result
@@ -309,14 +382,37 @@ class TestSearchUIRendering:
                 "subsets": [],
             },
         }
-        result = _render_dag_section(report)
-        assert "var SEARCH_INDEX=" in result
-        # Extract the JSON and verify it's valid
-        start = result.index("var SEARCH_INDEX=") + len("var SEARCH_INDEX=")
-        end = result.index(";</script>", start)
-        index_data = json.loads(result[start:end])
-        assert "//pkg:test_a" in index_data
-        assert index_data["//pkg:test_a"]["type"] == "test"
+        result = _render(_render_dag_section, report)
+        assert 'var SEARCH_INDEX_GZ="' in result
+        # Decode the embedded payload and verify it's valid
+        index_data = _embedded_search_index(result)
+        assert "//pkg:test_a" in index_data["ids"]
+        pos = index_data["ids"].index("//pkg:test_a")
+        assert index_data["types"][pos] == "test"
+        assert index_data["labels"][pos] == "test_a"
+        assert "a works" in index_data["fields"]["assertion"][pos]
+
+    def test_non_ascii_embedded_verbatim(self):
+        report = {
+            "test_set": {
+                "name": "root", "assertion": "", "status": "passed",
+                "tests": {
+                    "//pkg:café_test": {
+                        "assertion": "Grüße", "status": "passed",
+                    },
+                },
+                "subsets": [],
+            },
+        }
+        result = _render(_render_dag_section, report)
+        graph = result.partition("var GRAPH_DATA=")[2].partition(
+            ";</script>")[0]
+        index = _embedded_search_index(result)
+        assert '"//pkg:café_test"' in graph
+        assert "grüße" in index["fields"]["assertion"][
+            index["ids"].index("//pkg:café_test")
+        ]
+        assert "\\u00e9" not in graph
 
     def test_search_js_functions_present(self):
         report = {
@@ -325,7 +421,25 @@ class TestSearchUIRendering:
                 "tests": {}, "subsets": [],
             },
         }
-        result = _render_dag_section(report)
+        result = _render(_render_dag_section, report)
         assert "performSearch" in result
         assert "selectSearchResult" in result
         assert "parseQuery" in result
+        assert "buildTokenIndex" in result
+        assert "loadSearchIndex" in result
+        assert "DecompressionStream" in result
+        assert "matchTerm" in result
+
+    def test_search_index_load_failure_handled(self):
+        report = {
+            "test_set": {
+                "name": "root", "assertion": "", "status": "passed",
+                "tests": {}, "subsets": [],
+            },
+        }
+        result = _render(_render_dag_section, report)
+        # A failed inflate is forgotten so the next search retries, and
+        # the deferred search re-reads the box instead of a stale query.
+        assert "searchIndexLoading = null;" in result
+        assert "Search is unavailable in this browser" in result
+        assert "performSearch(searchInput.value);" in result
@@ -9,6 +9,8 @@ workspace tests" toggle checkbox.
 
 from __future__ import annotations
 
+import io
+
 from orchestrator.analysis.log_parser import BlockSegment, StepSegment
 from orchestrator.execution.executor import TestResult
 from orchestrator.reporting.html_reporter import (
@@ -22,6 +24,13 @@ from orchestrator.reporting.html_reporter import (
 from orchestrator.reporting.reporter import Reporter, _aggregate_status
 
 
+def _render(render_fn, *args, **kwargs) -> str:
+    """Run a writer-style ``_render_*`` helper and return its output."""
+    out = io.StringIO()
+    render_fn(out, *args, **kwargs)
+    return out.getvalue()
+
+
 class TestStepRendering:
     """Tests for step rendering in _render_block_segment."""
 
@@ -33,7 +42,7 @@ class TestStepRendering:
             status="passed",
         )
         block = BlockSegment(block="stimulation", steps=[step])
-        html = _render_block_segment(block)
+        html = _render(_render_block_segment, block)
 
         assert "<details" in html
         assert "Check inventory" in html
@@ -56,7 +65,7 @@ class TestStepRendering:
             status="failed",
         )
         block = BlockSegment(block="stimulation", steps=[step])
-        html = _render_block_segment(block)
+        html = _render(_render_block_segment, block)
 
         # Find the step-segment details tag
         idx = html.find('class="step-segment')
@@ -74,7 +83,7 @@ class TestStepRendering:
             status="warning",
         )
         block = BlockSegment(block="stimulation", steps=[step])
-        html = _render_block_segment(block)
+        html = _render(_render_block_segment, block)
 
         idx = html.find('class="step-segment')
         assert idx != -1
@@ -100,7 +109,7 @@ class TestStepRendering:
             steps=[middle],
         )
         block = BlockSegment(block="stimulation", steps=[outer])
-        html = _render_block_segment(block)
+        html = _render(_render_block_segment, block)
 
         # All three step <details> should have "open"
         # Count occurrences of step-segment with open
@@ -123,7 +132,7 @@ class TestStepRendering:
             status="passed",
         )
         block = BlockSegment(block="checkpoint", steps=[step])
-        html = _render_block_segment(block)
+        html = _render(_render_block_segment, block)
 
         # Status badge
         assert "step-status-badge" in html
@@ -147,7 +156,7 @@ class TestStepRendering:
             ],
         )
         block = BlockSegment(block="stimulation", steps=[step])
-        html = _render_block_segment(block)
+        html = _render(_render_block_segment, block)
 
         assert "measurements-table" in html
         assert "latency" in html
@@ -163,11 +172,28 @@ class TestStepRendering:
             errors=[{"message": "connection refused"}],
         )
         block = BlockSegment(block="stimulation", steps=[step])
-        html = _render_block_segment(block)
+        html = _render(_render_block_segment, block)
 
         assert "block-error" in html
         assert "connection refused" in html
 
+    def test_block_errors_mixed_forms(self):
+        """String and dict errors render in order; empty messages are skipped."""
+        block = BlockSegment(
+            block="verdict",
+            errors=[
+                "plain <failure>",
+                {"message": ""},
+                {"message": "timeout", "_file": "t.py", "_line": 7},
+            ],
+        )
+        html = _render(_render_block_segment, block)
+
+        assert html.count("block-error") == 2
+        assert "Error: plain &lt;failure&gt;</div>" in html
+        assert html.index("plain") < html.index("timeout")
+        assert "t.py:7" in html
+
     def test_nested_step_indentation(self):
         """Sub-steps are rendered inside parent body (DOM nesting)."""
         child = StepSegment(
@@ -182,7 +208,7 @@ class TestStepRendering:
             steps=[child],
         )
         block = BlockSegment(block="stimulation", steps=[parent])
-        html = _render_block_segment(block)
+        html = _render(_render_block_segment, block)
 
         # Both step names should appear
         assert "parent" in html
@@ -206,7 +232,7 @@ class TestStepRendering:
             block="rigging",
             features=[{"name": "auth"}],
         )
-        html = _render_block_segment(block)
+        html = _render(_render_block_segment, block)
 
         # Should have auth feature
         assert "auth" in html
@@ -224,7 +250,7 @@ class TestUndecidedStatus:
     def test_undecided_status_badge_renders(self):
         """Test entry with status=undecided renders UNDECIDED badge."""
         data = {"status": "undecided", "assertion": "Should pass"}
-        result = _render_test_entry("//pkg:my_test", data)
+        result = _render(_render_test_entry, "//pkg:my_test", data)
         assert "UNDECIDED" in result
 
     def test_undecided_dag_node_has_blue_color(self):
@@ -261,9 +287,11 @@ class TestUndecidedStatus:
                 "subsets": [],
             },
         }
-        result = _render_dag_section(report)
+        result = _render(_render_dag_section, report)
         assert 'id="dag-show-all"' in result
         assert "Show all workspace tests" in result
+        assert "node.hidden-notrun" in result
+        assert "notRunNodes.addClass('hidden-notrun')" in result
 
     def test_undecided_summary_badge(self):
         """Header shows Undecided badge when summary has undecided count."""
@@ -276,7 +304,7 @@ class TestUndecidedStatus:
                 "total_duration_seconds": 1.0,
             },
         }
-        result = _render_header(report)
+        result = _render(_render_header, report)
         assert "Undecided: 2" in result
 
     def test_build_test_entry_undecided(self):
@@ -357,14 +385,14 @@ class TestTriggerContext:
     def test_ci_gate_shown(self):
         """CI gate name appears when present."""
         report = {"ci_gate_name": "pr_test", "test_set": {"name": "pr_set"}}
-        result = _render_trigger_context(report)
+        result = _render(_render_trigger_context, report)
         assert "CI Gate:" in result
         assert "pr_test" in result
 
     def test_test_set_shown_alongside_ci_gate(self):
         """Test set name appears alongside CI gate."""
         report = {"ci_gate_name": "merge_test", "test_set": {"name": "merge_set"}}
-        result = _render_trigger_context(report)
+        result = _render(_render_trigger_context, report)
         assert "CI Gate:" in result
         assert "merge_test" in result
         assert "Test Set:" in result
@@ -373,7 +401,7 @@ class TestTriggerContext:
     def test_test_set_only_when_no_ci_gate(self):
         """Test set name is the primary label when no CI gate."""
         report = {"test_set": {"name": "my_tests"}}
-        result = _render_trigger_context(report)
+        result = _render(_render_trigger_context, report)
         assert "CI Gate:" not in result
         assert "Test Set:" in result
         assert "my_tests" in result
@@ -381,32 +409,32 @@ class TestTriggerContext:
     def test_direct_invocation_fallback(self):
         """Shows 'Direct invocation' when no CI gate or test set."""
         report = {"summary": {"total": 1}}
-        result = _render_trigger_context(report)
+        result = _render(_render_trigger_context, report)
         assert "Direct invocation" in result
 
     def test_execution_mode_pill(self):
         """Execution mode appears as a pill."""
         report = {"execution_mode": "detection"}
-        result = _render_trigger_context(report)
+        result = _render(_render_trigger_context, report)
         assert "detection" in result
         assert "trigger-pill" in result
 
     def test_effort_pill(self):
         """Effort mode appears as a pill."""
         report = {"effort": {"mode": "converge"}}
-        result = _render_trigger_context(report)
+        result = _render(_render_trigger_context, report)
         assert "effort: converge" in result
 
     def test_hash_filter_pill(self):
         """Hash filter summary appears as a pill."""
         report = {"hash_filter": {"changed": 5, "unchanged": 95, "skipped": 90}}
-        result = _render_trigger_context(report)
+        result = _render(_render_trigger_context, report)
         assert "hash-skip: 90/100" in result
 
     def test_no_effort_no_pill(self):
         """No effort pill when effort is absent."""
         report = {"execution_mode": "diagnostic"}
-        result = _render_trigger_context(report)
+        result = _render(_render_trigger_context, report)
         assert "effort:" not in result
 
     def test_trigger_context_in_header(self):
@@ -416,7 +444,7 @@ class TestTriggerContext:
             "execution_mode": "detection",
             "summary": {"total": 1, "total_duration_seconds": 0.5},
         }
-        result = _render_header(report)
+        result = _render(_render_header, report)
         assert "trigger-context" in result
         assert "CI Gate:" in result
         assert "detection" in result